@@ -1,5 +1,14 @@
 from .host import componentProviderHost
+from .local import LocalPackage
 from .metadata import Metadata
 from .provider import ComponentProvider
+from .registration import Component, register_component
 
-__all__ = ["ComponentProvider", "componentProviderHost", "Metadata"]
+__all__ = [
+    "Component",
+    "ComponentProvider",
+    "componentProviderHost",
+    "LocalPackage",
+    "Metadata",
+    "register_component",
+]
@@ -1,12 +1,12 @@
 import ast
-import importlib.util
+import importlib
 import inspect
-import sys
 from collections.abc import Awaitable
 from dataclasses import dataclass
 from pathlib import Path
 from types import ModuleType, NoneType
 from typing import (
+    Any,
     ForwardRef,
     Optional,
     Union,
@@ -17,6 +17,8 @@ from typing import (
 import pulumi
 
 from .metadata import Metadata
+from .modules import module_name, package_module
+from .registration import registrations
 from .util import camel_case
 
 
@@ -44,11 +46,21 @@ class ComponentSchema:
 
 
 class Analyzer:
-    def __init__(self, metadata: Metadata, path: Path):
+    def __init__(self, metadata: Metadata, path: Path, scan_unregistered: bool = False):
         self.path = path
         self.metadata = metadata
+        # Also look for unregistered components in modules that register
+        # components, see `find_component_classes`.
+        self.scan_unregistered = scan_unregistered
         self.docstrings: dict[str, dict[str, str]] = {}
         self.type_definitions: dict[str, TypeDefinition] = {}
+        self.analyzed_types: dict[type, TypeDefinition] = {}
+        # The keys of `type_definitions` so far, including types that are
+        # still being analyzed.
+        self.type_keys: set[str] = set()
+        self.component_classes: dict[str, type[pulumi.ComponentResource]] = {}
+        # The file and the module attribute each component was found at.
+        self.component_locations: dict[str, tuple[Path, str]] = {}
 
     def analyze(self) -> dict[str, ComponentSchema]:
         """
@@ -56,37 +68,85 @@ class Analyzer:
         ComponentResources in all the Python files.
         """
         self.docstrings = self.find_docstrings()
-        return self.analyze_dir()
+        components = self.analyze_dir()
+        self.merge_same_named_types(components)
+        return components
 
     def analyze_dir(self) -> dict[str, ComponentSchema]:
         components: dict[str, ComponentSchema] = {}
-        for file_path in self.path.iterdir():
-            if file_path.suffix != ".py":
-                continue
+        for file_path in self.python_files():
             comps = self.analyze_file(file_path)
             components.update(comps)
         return components
 
     def analyze_file(self, file_path: Path) -> dict[str, ComponentSchema]:
+        """
+        analyze_file analyzes the components defined in the module at
+        `file_path`. Components imported from other modules are analyzed with
+        the module that defines them.
+        """
         components: dict[str, ComponentSchema] = {}
         module_type = self.load_module(file_path)
+        for name, obj in self.find_component_classes(module_type):
+            if obj.__module__ != module_type.__name__ or name != obj.__name__:
+                # Imported from another module, or an alias like
+                # `Alias = Widget`, which would publish the same component
+                # under a second name.
+                continue
+            component_name = self.arg_name(obj.__name__)
+            existing = self.component_classes.get(component_name)
+            if existing is not None and existing is not obj:
+                other_file, _ = self.component_locations[component_name]
+                raise Exception(
+                    f"Component {component_name} is defined in both {other_file} and {file_path}"
+                )
+            component = self.analyze_component(obj)
+            components[component_name] = component
+            self.component_classes[component_name] = obj
+            self.component_locations[component_name] = (file_path, name)
+        return components
+
+    def find_component_classes(
+        self, module_type: ModuleType
+    ) -> list[tuple[str, type[pulumi.ComponentResource]]]:
+        """
+        Returns the attribute names and classes of the components in a module.
+
+        These are the components the module registered, see `registration.py`,
+        in definition order. Modules that don't register any components are
+        searched for direct subclasses of ComponentResource in their
+        attributes instead, which takes time proportional to the size of the
+        module. With `scan_unregistered` set, modules that register components
+        are searched too, and the unregistered components follow the
+        registered ones.
+        """
+        classes = [
+            (r.component.__name__, r.component)
+            for r in registrations.get(module_type.__name__, [])
+        ]
+        if classes and not self.scan_unregistered:
+            return classes
+        registered = {id(cls) for _, cls in classes}
         for name in dir(module_type):
             obj = getattr(module_type, name)
-            if inspect.isclass(obj):
-                if pulumi.ComponentResource in obj.__bases__:
-                    component = self.analyze_component(obj)
-                    components[self.arg_name(name)] = component
-        return components
+            if (
+                inspect.isclass(obj)
+                and pulumi.ComponentResource in obj.__bases__
+                and id(obj) not in registered
+            ):
+                classes.append((name, obj))
+        return classes
 
     def find_component(self, name: str) -> tuple[type[pulumi.ComponentResource], type]:
         """
         Find a component by name in the directory at `self.path` and return the
         ComponentResource class and its args class.
         """
-        for file_path in self.path.iterdir():
-            if file_path.suffix != ".py":
-                continue
+        for file_path in self.python_files():
             mod = self.load_module(file_path)
+            for r in registrations.get(mod.__name__, []):
+                if r.component.__name__ == name:
+                    return r.component, r.args
             comp = getattr(mod, name, None)
             if not comp:
                 continue
@@ -95,17 +155,23 @@ class Analyzer:
             return comp, args
         raise Exception(f"Could not find component {name}")
 
+    def python_files(self) -> list[Path]:
+        return sorted(p for p in self.path.iterdir() if p.suffix == ".py")
+
     def load_module(self, file_path: Path) -> ModuleType:
-        name = file_path.name.replace(".py", "")
-        spec = importlib.util.spec_from_file_location("component_file", file_path)
-        if not spec:
-            raise Exception(f"Could not load module spec at {file_path}")
-        module_type = importlib.util.module_from_spec(spec)
-        sys.modules[name] = module_type
-        if not spec.loader:
-            raise Exception(f"Could not load module at {file_path}")
-        spec.loader.exec_module(module_type)
-        return module_type
+        """
+        load_module loads the user module at `file_path` under its own name in
+        the namespace of the component package, see `modules.py`. Modules that
+        are already loaded are reused, call `unload_package` to load them from
+        source again.
+        """
+        name = module_name(file_path)
+        package_module(file_path.parent)
+        try:
+            return importlib.import_module(name)
+        except BaseException:
+            registrations.pop(name, None)
+            raise
 
     def analyze_component(
         self,
@@ -152,13 +218,12 @@ class Analyzer:
         types = {}
         if not hasattr(typ, "__annotations__"):
             return types
-        for k, v in typ.__annotations__.items():
+        for k, (cls, v) in class_annotations(typ).items():
             (schema_property, type_def) = self.analyze_arg(v)
-            schema_property.description = self.docstrings.get(typ.__name__, {}).get(k)
+            schema_property.description = self.docstrings.get(cls.__name__, {}).get(k)
             if type_def:
                 self.type_definitions[type_def.name] = type_def
-                ref = f"#/types/{self.metadata.name}:index:{type_def.name}"
-                schema_property.ref = ref
+                schema_property.ref = self.type_ref(type_def.name)
             types[self.arg_name(k)] = schema_property
         return types
 
@@ -180,16 +245,37 @@ class Analyzer:
             return self.analyze_arg(unwrap_input(arg), optional=optional)
         elif is_output(arg):
             return self.analyze_arg(unwrap_output(arg), optional=optional)
+        elif (
+            get_origin(arg) is Union
+            and len([t for t in get_args(arg) if t is not NoneType]) > 1
+        ):
+            # Unions other than Optional and Input can't be expressed in the
+            # schema, Optional[Union[A, B]] neither.
+            raise ValueError(f"Unsupported union type {arg}")
         elif is_optional(arg):
             return self.analyze_arg(unwrap_optional(arg), optional=True)
         elif not is_builtin(arg):
             unwrapped = None
-            type_def = TypeDefinition(
-                name=self.arg_name(arg.__name__),
-                type="object",
-                properties=self.analyze_types(arg),
-                description=arg.__doc__,
-            )
+            type_def = self.analyzed_types.get(arg)
+            if type_def is None:
+                name = self.arg_name(arg.__name__)
+                if name in self.type_keys:
+                    # Another class with the same name, for example from
+                    # another module. Keep it apart until
+                    # `merge_same_named_types` checks whether the two match.
+                    name = f"{arg.__module__}.{arg.__qualname__}"
+                self.type_keys.add(name)
+                type_def = TypeDefinition(
+                    name=name,
+                    type="object",
+                    properties={},
+                    description=arg.__doc__,
+                )
+                # Remember the type before analyzing its properties, so that
+                # types referencing themselves don't recurse forever, and types
+                # used in many places are only analyzed once.
+                self.analyzed_types[arg] = type_def
+                type_def.properties = self.analyze_types(arg)
         else:
             raise ValueError(f"Unsupported type {arg}")
         # TODO:
@@ -205,6 +291,85 @@ class Analyzer:
             type_def,
         )
 
+    def dedupe_type_definitions(self, components: dict[str, ComponentSchema]) -> None:
+        """
+        dedupe_type_definitions merges type definitions that have the same
+        shape into the first one of them, and points all the references in
+        `components` and in the remaining type definitions to it.
+
+        Merging can make types that reference the merged types identical, so we
+        repeat until nothing changes.
+        """
+        while True:
+            seen: dict[tuple, str] = {}
+            refs: dict[str, str] = {}
+            for name, type_def in self.type_definitions.items():
+                shape = type_shape(type_def)
+                if shape in seen:
+                    refs[self.type_ref(name)] = self.type_ref(seen[shape])
+                else:
+                    seen[shape] = name
+            if not refs:
+                return
+            self.replace_refs(refs, components)
+
+    def merge_same_named_types(self, components: dict[str, ComponentSchema]) -> None:
+        """
+        merge_same_named_types merges the type definitions of different classes
+        with the same name, like a `Tags` class in two modules, into the first
+        one of them if they have the same shape. Types with the same name but
+        a different shape can't both be in the schema, and raise an exception.
+
+        Like in `dedupe_type_definitions`, merging can make types that
+        reference the merged types identical, so we repeat until nothing
+        changes.
+        """
+        while True:
+            refs: dict[str, str] = {}
+            for key, type_def in self.type_definitions.items():
+                name = self.arg_name(key.rpartition(".")[2])
+                first = self.type_definitions.get(name)
+                if key != name and first and type_shape(first) == type_shape(type_def):
+                    refs[self.type_ref(key)] = self.type_ref(name)
+            if not refs:
+                break
+            self.replace_refs(refs, components)
+        classes = {type_def.name: typ for typ, type_def in self.analyzed_types.items()}
+        for key in self.type_definitions:
+            name = self.arg_name(key.rpartition(".")[2])
+            if key != name:
+                first = inspect.getfile(classes[name])
+                other = inspect.getfile(classes[key])
+                raise Exception(
+                    f"Type {name} is defined differently in {first} and {other}"
+                )
+
+    def replace_refs(
+        self, refs: dict[str, str], components: dict[str, ComponentSchema]
+    ) -> None:
+        """
+        replace_refs removes the type definitions that are referenced by the
+        keys of `refs`, and points all the references to them in `components`
+        and in the remaining type definitions to the values of `refs` instead.
+        """
+        self.type_definitions = {
+            name: type_def
+            for name, type_def in self.type_definitions.items()
+            if self.type_ref(name) not in refs
+        }
+        properties = [
+            p for t in self.type_definitions.values() for p in t.properties.values()
+        ]
+        for component in components.values():
+            properties.extend(component.inputs.values())
+            properties.extend(component.outputs.values())
+        for p in properties:
+            if p.ref in refs:
+                p.ref = refs[p.ref]
+
+    def type_ref(self, name: str) -> str:
+        return f"#/types/{self.metadata.name}:index:{name}"
+
     def find_docstrings(self) -> dict[str, dict[str, str]]:
         """
         find_docstrings returns the docstrings for all the attributes of all
@@ -215,9 +380,7 @@ class Analyzer:
         runtime information we parse the source code to extract the docstrings.
         """
         docs = {}
-        for file_path in self.path.iterdir():
-            if file_path.suffix != ".py":
-                continue
+        for file_path in self.python_files():
             with open(file_path) as f:
                 src = f.read()
                 t = ast.parse(src)
@@ -230,25 +393,17 @@ class Analyzer:
             if isinstance(stmt, ast.ClassDef):
                 class_name = stmt.name
                 docs[class_name] = {}
-                it = iter(stmt.body)
-                while True:
-                    try:
-                        node = next(it)
-                        # Look for an assignment with a type annotation
-                        if isinstance(node, ast.AnnAssign):
-                            if isinstance(node.target, ast.Name):
-                                name = node.target.id
-                                # Look for a docstring right after the assignment
-                                node = next(it)
-                                if isinstance(node, ast.Expr) and isinstance(
-                                    node.value, ast.Str
-                                ):
-                                    docs[class_name][name] = node.value.value
-                                else:
-                                    # Push back the node if it's not a docstring
-                                    it = iter([node] + list(it))
-                    except StopIteration:
-                        break
+                # Look for an assignment with a type annotation, followed by a
+                # docstring.
+                for node, next_node in zip(stmt.body, stmt.body[1:]):
+                    if (
+                        isinstance(node, ast.AnnAssign)
+                        and isinstance(node.target, ast.Name)
+                        and isinstance(next_node, ast.Expr)
+                        and isinstance(next_node.value, ast.Constant)
+                        and isinstance(next_node.value.value, str)
+                    ):
+                        docs[class_name][node.target.id] = next_node.value.value
 
         return docs
 
@@ -256,6 +411,37 @@ class Analyzer:
         return camel_case(name)
 
 
+def class_annotations(typ: type) -> dict[str, tuple[type, Any]]:
+    """
+    Returns the annotations of `typ` and of its base classes, with the class
+    that declares each of them. Annotations of subclasses replace those of
+    their bases. The private annotations of pulumi.ComponentResource and its
+    bases are left out.
+    """
+    annotations: dict[str, tuple[type, Any]] = {}
+    for cls in reversed(inspect.getmro(typ)):
+        if cls in pulumi.ComponentResource.__mro__:
+            continue
+        for k, v in inspect.get_annotations(cls).items():
+            annotations[k] = (cls, v)
+    return annotations
+
+
+def type_shape(type_def: TypeDefinition) -> tuple:
+    """
+    Returns a hashable description of the structure of a type definition.
+    Names and descriptions don't contribute to the shape.
+    """
+    return (
+        type_def.type,
+        tuple(
+            sorted(
+                (k, p.type_, p.ref, p.optional) for k, p in type_def.properties.items()
+            )
+        ),
+    )
+
+
 def is_plain(typ: type) -> bool:
     return typ in (str, int, float, bool)
 
@@ -0,0 +1,161 @@
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from pathlib import Path
+from typing import Optional
+
+from . import host
+from .metadata import read_metadata
+from .modules import unload_package
+from .worker import analyze_package
+
+# Directories we never look for component packages in.
+SKIP_DIRS = {"node_modules", "venv", "__pycache__", "dist", "build"}
+
+
+@dataclass
+class BatchResult:
+    path: Path
+    name: str
+    components: int
+    types: int
+    seconds: float
+    error: Optional[str] = None
+
+
+def find_packages(root: Path) -> list[Path]:
+    """
+    find_packages returns the directories below `root` that contain a
+    `__main__.py` calling `componentProviderHost`.
+    """
+    packages = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = sorted(
+            d for d in dirnames if not d.startswith(".") and d not in SKIP_DIRS
+        )
+        if "__main__.py" not in filenames:
+            continue
+        main = Path(dirpath) / "__main__.py"
+        if "componentProviderHost" in main.read_text():
+            packages.append(Path(dirpath).absolute())
+    return packages
+
+
+def analyze_one(path: Path, out: Path, dedupe_types: bool = False) -> BatchResult:
+    """
+    analyze_one writes the schema and the component index of the package at
+    `path` to `out/<package name>/`. Afterwards the package's modules are
+    unloaded again, but modules it imported from elsewhere, like `pulumi`,
+    stay loaded for the next package.
+    """
+    start = time.perf_counter()
+    name = path.name
+    try:
+        metadata = read_metadata(path)
+        name = metadata.name
+        with host.suppress_hosting():
+            schema, index = analyze_package(metadata, path, dedupe_types)
+        dest = out / metadata.name
+        dest.mkdir(parents=True, exist_ok=True)
+        with open(dest / "schema.json", "w") as f:
+            json.dump(schema, f, indent=2)
+        with open(dest / "index.json", "w") as f:
+            json.dump(
+                {
+                    name: {"file": file, "attribute": attribute}
+                    for name, (file, attribute) in index.items()
+                },
+                f,
+                indent=2,
+            )
+        return BatchResult(
+            path=path,
+            name=metadata.name,
+            components=len(schema["resources"]),
+            types=len(schema["types"]),
+            seconds=time.perf_counter() - start,
+        )
+    except Exception as e:
+        return BatchResult(
+            path=path,
+            name=name,
+            components=0,
+            types=0,
+            seconds=time.perf_counter() - start,
+            error=f"{type(e).__name__}: {e}",
+        )
+    finally:
+        unload_package(path)
+
+
+def run_batch(
+    root: Path, out: Path, workers: int = 1, dedupe_types: bool = False
+) -> list[BatchResult]:
+    """
+    run_batch analyzes all the component packages below `root`. With a single
+    worker all packages are analyzed in this process, otherwise in a pool of
+    `workers` processes. Either way each process imports `pulumi` and the
+    other shared dependencies only once. Packages with the same name as an
+    earlier package are reported as failed instead of analyzed.
+    """
+    packages = find_packages(root)
+    out = out.absolute()
+    results = {
+        path: BatchResult(
+            path=path,
+            name=name,
+            components=0,
+            types=0,
+            seconds=0.0,
+            error=f"The package at {other} is named {name} too",
+        )
+        for path, (name, other) in duplicate_names(packages).items()
+    }
+    todo = [path for path in packages if path not in results]
+    if workers <= 1:
+        analyzed = [analyze_one(path, out, dedupe_types) for path in todo]
+    else:
+        # Don't fork, the parent may have threads running.
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            analyzed = list(
+                pool.map(analyze_one, todo, repeat(out), repeat(dedupe_types))
+            )
+    results.update((result.path, result) for result in analyzed)
+    return [results[path] for path in packages]
+
+
+def duplicate_names(packages: list[Path]) -> dict[Path, tuple[str, Path]]:
+    """
+    duplicate_names returns the packages that have the same name as a package
+    before them in `packages`, with that name and the earlier package. They
+    would overwrite each other's schema in the output directory, so they're
+    not analyzed. Packages whose metadata can't be read are left to
+    `analyze_one` to report.
+    """
+    first: dict[str, Path] = {}
+    duplicates = {}
+    for path in packages:
+        try:
+            name = read_metadata(path).name
+        except Exception:
+            continue
+        if name in first:
+            duplicates[path] = (name, first[name])
+        else:
+            first[name] = path
+    return duplicates
+
+
+def format_results(results: list[BatchResult]) -> str:
+    lines = [f"{'package':<30} {'components':>10} {'types':>6} {'ms':>10}  error"]
+    for r in results:
+        lines.append(
+            f"{r.name:<30} {r.components:>10} {r.types:>6} "
+            f"{r.seconds * 1000:>10.1f}  {r.error or ''}".rstrip()
+        )
+    return "\n".join(lines)
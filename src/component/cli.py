@@ -0,0 +1,197 @@
+import argparse
+import asyncio
+import cProfile
+import json
+import pstats
+import sys
+from pathlib import Path
+from typing import Optional
+
+from . import host
+from .metadata import read_metadata
+
+
+def profile(args: argparse.Namespace) -> None:
+    from .profiler import profile
+
+    report = profile(read_metadata(args.dir), args.dir)
+    print(report.to_table(top=args.top))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report.to_json(), f, indent=2)
+
+
+def emit_schema(args: argparse.Namespace) -> None:
+    from .schema_writer import emit_schema
+
+    metadata = read_metadata(args.dir)
+    if args.output:
+        with open(args.output, "w") as f:
+            emit_schema(metadata, args.dir, f, dedupe_types=args.dedupe_types)
+    else:
+        emit_schema(metadata, args.dir, sys.stdout, dedupe_types=args.dedupe_types)
+
+
+def gen_sdk(args: argparse.Namespace) -> None:
+    from .sdk import gen_sdk
+
+    for path in gen_sdk(read_metadata(args.dir), args.dir, args.out):
+        print(f"wrote {path}")
+
+
+def load_test(args: argparse.Namespace) -> None:
+    from .loadtest import run_load_test
+    from .provider import ComponentProvider
+
+    provider = ComponentProvider(
+        read_metadata(args.dir),
+        args.dir,
+        warm_up=args.warm_up,
+        isolated_analysis=args.isolated_analysis,
+    )
+    report = asyncio.run(
+        run_load_test(
+            provider,
+            args.type,
+            json.loads(args.inputs),
+            constructs=args.constructs,
+            schemas=args.schemas,
+            concurrency=args.concurrency,
+            sample_interval=args.sample_interval,
+        )
+    )
+    print(report.to_table())
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report.to_json(), f, indent=2)
+
+
+def batch(args: argparse.Namespace) -> None:
+    from .batch import format_results, run_batch
+
+    results = run_batch(
+        args.root, args.out, workers=args.workers, dedupe_types=args.dedupe_types
+    )
+    print(format_results(results))
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+def replay(args: argparse.Namespace) -> None:
+    from .provider import ComponentProvider
+    from .recording import format_replay, read_recording, replay
+
+    provider = ComponentProvider(read_metadata(args.dir), args.dir)
+    records = read_recording(args.recording)
+    profiler = cProfile.Profile() if args.profile else None
+    results = asyncio.run(replay(provider, records, profiler))
+    print(format_replay(results))
+    if profiler:
+        profiler.dump_stats(args.profile)
+        print()
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(args.top)
+    if any(r.error for r in results):
+        sys.exit(1)
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m component")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="Report import, analysis and docstring parsing time for a component package",
+    )
+    profile_parser.add_argument("dir", type=Path, help="Component package directory")
+    profile_parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    profile_parser.add_argument(
+        "--top", type=int, default=10, help="Number of imports to list per module"
+    )
+    profile_parser.set_defaults(func=profile)
+
+    emit_parser = subparsers.add_parser(
+        "emit-schema", help="Write the schema of a component package"
+    )
+    emit_parser.add_argument("dir", type=Path, help="Component package directory")
+    emit_parser.add_argument(
+        "-o", "--output", type=Path, help="Write to this file instead of stdout"
+    )
+    emit_parser.add_argument(
+        "--dedupe-types",
+        action="store_true",
+        help="Merge structurally identical types",
+    )
+    emit_parser.set_defaults(func=emit_schema)
+
+    sdk_parser = subparsers.add_parser(
+        "gen-sdk", help="Generate a Python SDK for a component package"
+    )
+    sdk_parser.add_argument("dir", type=Path, help="Component package directory")
+    sdk_parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    sdk_parser.set_defaults(func=gen_sdk)
+
+    load_parser = subparsers.add_parser(
+        "load-test",
+        help="Drive Construct and GetSchema calls at a provider with a fake engine",
+    )
+    load_parser.add_argument("dir", type=Path, help="Component package directory")
+    load_parser.add_argument(
+        "--type",
+        required=True,
+        help="Type token of the component to construct, e.g. my-component:index:MyComponent",
+    )
+    load_parser.add_argument(
+        "--inputs", default="{}", help="Construct inputs as JSON, keyed by schema name"
+    )
+    load_parser.add_argument("--constructs", type=int, default=1000)
+    load_parser.add_argument("--schemas", type=int, default=0)
+    load_parser.add_argument("--concurrency", type=int, default=10)
+    load_parser.add_argument(
+        "--sample-interval",
+        type=float,
+        default=1.0,
+        help="Seconds between RSS, file descriptor and thread count samples",
+    )
+    load_parser.add_argument("--warm-up", action="store_true")
+    load_parser.add_argument("--isolated-analysis", action="store_true")
+    load_parser.add_argument("--json", type=Path, help="Also write the report as JSON")
+    load_parser.set_defaults(func=load_test)
+
+    batch_parser = subparsers.add_parser(
+        "batch",
+        help="Write the schema and component index of every component package below a directory",
+    )
+    batch_parser.add_argument("root", type=Path, help="Directory to search for packages")
+    batch_parser.add_argument("--out", type=Path, required=True, help="Output directory")
+    batch_parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of worker processes, 1 analyzes all packages in this process",
+    )
+    batch_parser.add_argument(
+        "--dedupe-types",
+        action="store_true",
+        help="Merge structurally identical types",
+    )
+    batch_parser.set_defaults(func=batch)
+
+    replay_parser = subparsers.add_parser(
+        "replay",
+        help="Replay recorded Construct requests against a provider with a fake engine",
+    )
+    replay_parser.add_argument("dir", type=Path, help="Component package directory")
+    replay_parser.add_argument(
+        "recording", type=Path, help="Recording written by componentProviderHost"
+    )
+    replay_parser.add_argument(
+        "--profile", type=Path, help="Run under cProfile and write the stats here"
+    )
+    replay_parser.add_argument(
+        "--top", type=int, default=20, help="Number of functions to list when profiling"
+    )
+    replay_parser.set_defaults(func=replay)
+
+    args = parser.parse_args(argv)
+    with host.suppress_hosting():
+        args.func(args)
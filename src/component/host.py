@@ -1,11 +1,13 @@
+import os
 import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 from typing import Optional
 
-from pulumi.provider import main
-
 from .metadata import Metadata
 from .provider import ComponentProvider
+from .server import ComponentProviderServicer, serve
 
 # Bail out if we're already hosting. This prevents recursion when the analyzer
 # loads this file. It's usually good style to not run code at import time, and
@@ -13,7 +15,48 @@ from .provider import ComponentProvider
 is_hosting = False
 
 
-def componentProviderHost(metadata: Optional[Metadata] = None):
+@contextmanager
+def suppress_hosting() -> Iterator[None]:
+    """
+    suppress_hosting makes `componentProviderHost` return right away while the
+    context is active, so that loading a component package's `__main__.py`
+    doesn't start a provider. The previous state is restored afterwards.
+    """
+    global is_hosting
+    hosting = is_hosting
+    is_hosting = True
+    try:
+        yield
+    finally:
+        is_hosting = hosting
+
+
+def componentProviderHost(
+    metadata: Optional[Metadata] = None,
+    dedupe_types: bool = False,
+    warm_up: bool = False,
+    isolated_analysis: bool = False,
+    record: Optional[str] = None,
+    record_secrets: bool = False,
+):
+    """
+    componentProviderHost starts a provider for the components in the
+    directory of the program.
+
+    With `warm_up` set, the provider starts serving right away and imports and
+    analyzes the components in the background. Construct requests only wait
+    for the component they need.
+
+    With `isolated_analysis` set, the schema is generated in a short-lived
+    subprocess, and the provider only imports the modules of the components
+    it constructs.
+
+    With `record` set to a path, or the `PULUMI_COMPONENT_RECORD` environment
+    variable set, every Construct request is appended to that file, to replay
+    it later with `python -m component replay`. The values of secret config
+    and secret inputs are redacted, unless `record_secrets` is set, or the
+    `PULUMI_COMPONENT_RECORD_SECRETS` environment variable is set to `true`.
+    """
     global is_hosting
     if is_hosting:
         return
@@ -21,4 +64,23 @@ def componentProviderHost(metadata: Optional[Metadata] = None):
     path = Path(sys.argv[0])
     if metadata is None:
         metadata = Metadata(path.absolute().name, "0.0.1")
-    main(ComponentProvider(metadata, path), sys.argv[1:])
+    provider = ComponentProvider(
+        metadata,
+        path,
+        dedupe_types=dedupe_types,
+        warm_up=warm_up,
+        isolated_analysis=isolated_analysis,
+    )
+    args = sys.argv[1:]
+    record = record or os.environ.get("PULUMI_COMPONENT_RECORD")
+    if record:
+        from .recording import Recorder, RecordingServicer
+
+        record_secrets = (
+            record_secrets
+            or os.environ.get("PULUMI_COMPONENT_RECORD_SECRETS", "").lower() == "true"
+        )
+        recorder = Recorder(Path(record).absolute(), keep_secrets=record_secrets)
+        serve(args, lambda engine: RecordingServicer(provider, args, engine, recorder))
+    else:
+        serve(args, lambda engine: ComponentProviderServicer(provider, args, engine))
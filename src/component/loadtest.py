@@ -0,0 +1,256 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent import futures
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import grpc
+from google.protobuf import empty_pb2, struct_pb2
+from pulumi.runtime.proto import (
+    engine_pb2,
+    engine_pb2_grpc,
+    provider_pb2,
+    provider_pb2_grpc,
+    resource_pb2,
+    resource_pb2_grpc,
+)
+
+from .provider import ComponentProvider
+from .server import ComponentProviderServicer
+
+# A load test harness for ComponentProvider. It serves the provider over gRPC
+# the same way `componentProviderHost` does, but against an in-process fake
+# engine and resource monitor, and drives Construct and GetSchema calls at it.
+
+
+class FakeResourceMonitor(resource_pb2_grpc.ResourceMonitorServicer):
+    """
+    FakeResourceMonitor accepts every resource registration and echoes the
+    inputs back as outputs.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.registrations = 0
+
+    def SupportsFeature(self, request, context):
+        return resource_pb2.SupportsFeatureResponse(hasSupport=True)
+
+    def RegisterResource(self, request, context):
+        with self.lock:
+            self.registrations += 1
+        urn = f"urn:pulumi:load-test::load-test::{request.type}::{request.name}"
+        return resource_pb2.RegisterResourceResponse(
+            urn=urn,
+            id="" if not request.custom else f"{request.name}-id",
+            object=request.object,
+        )
+
+    def RegisterResourceOutputs(self, request, context):
+        return empty_pb2.Empty()
+
+    def Invoke(self, request, context):
+        return resource_pb2.InvokeResponse(**{"return": struct_pb2.Struct()})
+
+    def RegisterPackage(self, request, context):
+        return resource_pb2.RegisterPackageResponse(ref=f"{request.name}-ref")
+
+    def SignalAndWaitForShutdown(self, request, context):
+        return empty_pb2.Empty()
+
+
+class FakeEngine(engine_pb2_grpc.EngineServicer):
+    def Log(self, request, context):
+        return empty_pb2.Empty()
+
+    def GetRootResource(self, request, context):
+        return engine_pb2.GetRootResourceResponse(urn="")
+
+    def SetRootResource(self, request, context):
+        return engine_pb2.SetRootResourceResponse()
+
+
+@dataclass
+class Sample:
+    seconds: float
+    rss_bytes: Optional[int]
+    fds: Optional[int]
+    threads: int
+
+
+@dataclass
+class LoadTestReport:
+    latencies: dict[str, list[float]]
+    """Latency of each call in seconds, by method."""
+    errors: dict[str, int]
+    seconds: float
+    registrations: int = 0
+    """Number of resources registered with the fake resource monitor."""
+    samples: list[Sample] = field(default_factory=list)
+
+    def percentile(self, method: str, p: float) -> float:
+        values = sorted(self.latencies[method])
+        if not values:
+            return 0.0
+        # Nearest rank
+        rank = max(0, min(len(values) - 1, round(p / 100 * len(values)) - 1))
+        return values[rank]
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "seconds": self.seconds,
+            "registrations": self.registrations,
+            "methods": {
+                method: {
+                    "calls": len(latencies),
+                    "errors": self.errors.get(method, 0),
+                    "throughput": len(latencies) / self.seconds if self.seconds else 0,
+                    "p50": self.percentile(method, 50),
+                    "p95": self.percentile(method, 95),
+                    "p99": self.percentile(method, 99),
+                }
+                for method, latencies in self.latencies.items()
+            },
+            "samples": [
+                {
+                    "seconds": s.seconds,
+                    "rssBytes": s.rss_bytes,
+                    "fds": s.fds,
+                    "threads": s.threads,
+                }
+                for s in self.samples
+            ],
+        }
+
+    def to_table(self) -> str:
+        lines = [
+            f"{'method':<12} {'calls':>8} {'errors':>8} {'req/s':>10} "
+            f"{'p50 ms':>10} {'p95 ms':>10} {'p99 ms':>10}"
+        ]
+        for method, stats in self.to_json()["methods"].items():
+            lines.append(
+                f"{method:<12} {stats['calls']:>8} {stats['errors']:>8} "
+                f"{stats['throughput']:>10.1f} {stats['p50'] * 1000:>10.1f} "
+                f"{stats['p95'] * 1000:>10.1f} {stats['p99'] * 1000:>10.1f}"
+            )
+        lines.append("")
+        lines.append(f"registered resources: {self.registrations}")
+        if self.samples:
+            lines.append("")
+            lines.append(f"{'seconds':>8} {'rss MiB':>10} {'fds':>6} {'threads':>8}")
+            for s in self.samples:
+                rss = f"{s.rss_bytes / (1024 * 1024):.1f}" if s.rss_bytes else "-"
+                fds = str(s.fds) if s.fds is not None else "-"
+                lines.append(f"{s.seconds:>8.1f} {rss:>10} {fds:>6} {s.threads:>8}")
+        return "\n".join(lines)
+
+
+def sample(start: float) -> Sample:
+    """
+    Returns the resident set size, open file descriptors and threads of this
+    process. RSS and file descriptors are only available on Linux.
+    """
+    rss = None
+    fds = None
+    threads = threading.active_count()
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    rss = int(line.split()[1]) * 1024
+                elif line.startswith("Threads:"):
+                    threads = int(line.split()[1])
+        fds = len(os.listdir("/proc/self/fd"))
+    except OSError:
+        pass
+    return Sample(time.perf_counter() - start, rss, fds, threads)
+
+
+def start_fakes(max_workers: int) -> tuple[grpc.Server, FakeResourceMonitor, str]:
+    """
+    start_fakes serves a fake engine and resource monitor on the same port, and
+    returns the server, the monitor and their address.
+    """
+    monitor = FakeResourceMonitor()
+    fakes = grpc.server(futures.ThreadPoolExecutor(max_workers=max_workers))
+    resource_pb2_grpc.add_ResourceMonitorServicer_to_server(monitor, fakes)
+    engine_pb2_grpc.add_EngineServicer_to_server(FakeEngine(), fakes)
+    port = fakes.add_insecure_port("127.0.0.1:0")
+    fakes.start()
+    return fakes, monitor, f"127.0.0.1:{port}"
+
+
+async def run_load_test(
+    provider: ComponentProvider,
+    resource_type: str,
+    inputs: dict[str, Any],
+    constructs: int = 1000,
+    schemas: int = 0,
+    concurrency: int = 10,
+    sample_interval: float = 1.0,
+) -> LoadTestReport:
+    """
+    run_load_test serves `provider` and sends it `constructs` Construct calls
+    for `resource_type` with `inputs`, and `schemas` GetSchema calls, with at
+    most `concurrency` calls in flight.
+    """
+    fakes, monitor, address = start_fakes(max_workers=concurrency + 4)
+    server = grpc.aio.server()
+    servicer = ComponentProviderServicer(provider, [], address)
+    provider_pb2_grpc.add_ResourceProviderServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    report = LoadTestReport(
+        latencies={"Construct": [], "GetSchema": []}, errors={}, seconds=0.0
+    )
+    request_inputs = struct_pb2.Struct()
+    request_inputs.update(inputs)
+    semaphore = asyncio.Semaphore(concurrency)
+    start = time.perf_counter()
+
+    async def sampler() -> None:
+        while True:
+            report.samples.append(sample(start))
+            await asyncio.sleep(sample_interval)
+
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = provider_pb2_grpc.ResourceProviderStub(channel)
+
+            async def call(method: str, i: int) -> None:
+                async with semaphore:
+                    call_start = time.perf_counter()
+                    try:
+                        if method == "Construct":
+                            await stub.Construct(
+                                provider_pb2.ConstructRequest(
+                                    project="load-test",
+                                    stack="load-test",
+                                    organization="organization",
+                                    monitorEndpoint=address,
+                                    type=resource_type,
+                                    name=f"load-test-{i}",
+                                    inputs=request_inputs,
+                                )
+                            )
+                        else:
+                            await stub.GetSchema(provider_pb2.GetSchemaRequest())
+                    except grpc.aio.AioRpcError:
+                        report.errors[method] = report.errors.get(method, 0) + 1
+                    report.latencies[method].append(time.perf_counter() - call_start)
+
+            sampling = asyncio.create_task(sampler())
+            calls = [call("Construct", i) for i in range(constructs)]
+            calls.extend(call("GetSchema", i) for i in range(schemas))
+            await asyncio.gather(*calls)
+            report.seconds = time.perf_counter() - start
+            report.registrations = monitor.registrations
+            sampling.cancel()
+            report.samples.append(sample(start))
+    finally:
+        await server.stop(None)
+        fakes.stop(None)
+    return report
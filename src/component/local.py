@@ -0,0 +1,41 @@
+from pathlib import Path
+from typing import Optional
+
+import pulumi
+from pulumi.provider import ConstructResult
+
+from . import host
+from .metadata import Metadata, read_metadata
+from .registry import ComponentRegistry
+
+
+class LocalPackage:
+    """
+    LocalPackage constructs the components of the component package at `path`
+    in the current process, for Pulumi programs written in Python.
+
+    Components are resolved through the same ComponentRegistry the provider
+    uses, so inputs and outputs are keyed by their schema names, and the
+    components are registered with the same type tokens, but there is no gRPC
+    round-trip and no provider process.
+    """
+
+    def __init__(self, path: Path, metadata: Optional[Metadata] = None) -> None:
+        path = path.absolute()
+        with host.suppress_hosting():
+            self.registry = ComponentRegistry(metadata or read_metadata(path), path)
+
+    def construct(
+        self,
+        name: str,
+        resource_type: str,
+        inputs: pulumi.Inputs,
+        options: Optional[pulumi.ResourceOptions] = None,
+    ) -> ConstructResult:
+        """
+        construct creates the component `resource_type`, for example
+        `my-component:index:SelfSignedCertificate`, named `name`, and returns
+        its URN and outputs. The arguments are in the same order as for
+        `ComponentProvider.construct`.
+        """
+        return self.registry.construct(name, resource_type, inputs, options)
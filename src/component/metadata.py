@@ -1,4 +1,6 @@
+import ast
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
 
@@ -7,3 +9,38 @@ class Metadata:
     name: str
     version: str
     display_name: Optional[str] = None
+
+
+def read_metadata(path: Path) -> Metadata:
+    """
+    read_metadata returns the Metadata passed to `componentProviderHost` in the
+    `__main__.py` file of the component package at `path`.
+
+    We parse the source instead of running it, running `__main__.py` would
+    start the provider. If no literal `Metadata(...)` call is found, we use the
+    same defaults as `componentProviderHost`.
+    """
+    main = path / "__main__.py"
+    if main.exists():
+        with open(main) as f:
+            t = ast.parse(f.read())
+        for node in ast.walk(t):
+            if not isinstance(node, ast.Call):
+                continue
+            func = node.func
+            func_name = func.id if isinstance(func, ast.Name) else None
+            if isinstance(func, ast.Attribute):
+                func_name = func.attr
+            if func_name != "Metadata":
+                continue
+            try:
+                args = [ast.literal_eval(arg) for arg in node.args]
+                kwargs = {
+                    kw.arg: ast.literal_eval(kw.value)
+                    for kw in node.keywords
+                    if kw.arg is not None
+                }
+                return Metadata(*args, **kwargs)
+            except (ValueError, TypeError):
+                break
+    return Metadata(path.absolute().name, "0.0.1")
@@ -0,0 +1,168 @@
+import builtins
+import hashlib
+import importlib.abc
+import importlib.machinery
+import re
+import sys
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Optional
+
+from .registration import registrations
+
+# User modules are loaded as `_pulumi_components.<package>.<module>`, where
+# `<package>` is unique per component package directory. This keeps modules
+# with the same file name in different packages apart, and lets us unload all
+# the modules of a package together.
+#
+# Sibling imports, like `from utils import VALUE` in a component module, are
+# resolved in the namespace of the importing package too. Every module of a
+# package is executed with its own `__import__` builtin, which maps the names
+# of the files and directories in the package directory to the package's
+# namespace, and leaves all other imports alone.
+NAMESPACE = "_pulumi_components"
+
+# Package name to the builtins its modules are executed with.
+package_builtins: dict[str, dict[str, Any]] = {}
+
+
+def package_namespace(path: Path) -> str:
+    """
+    Returns the dotted module name prefix for the component package at `path`.
+    """
+    path = path.absolute()
+    digest = hashlib.sha256(str(path).encode()).hexdigest()[:12]
+    name = re.sub(r"\W", "_", path.name)
+    return f"{NAMESPACE}.{name}_{digest}"
+
+
+def module_name(file_path: Path) -> str:
+    """
+    Returns the unique module name for the user module at `file_path`.
+    """
+    return f"{package_namespace(file_path.parent)}.{file_path.stem}"
+
+
+def package_module(path: Path) -> ModuleType:
+    """
+    package_module returns the module of the component package at `path`,
+    which the modules of the package are loaded into, and creates it if
+    needed.
+    """
+    if finder not in sys.meta_path:
+        sys.meta_path.insert(0, finder)
+    if NAMESPACE not in sys.modules:
+        sys.modules[NAMESPACE] = new_package(NAMESPACE, [])
+    name = package_namespace(path)
+    module = sys.modules.get(name)
+    if module is None:
+        module = new_package(name, [str(path.absolute())])
+        package_builtins[name] = sibling_builtins(name, path.absolute())
+        sys.modules[name] = module
+    return module
+
+
+def new_package(name: str, locations: list[str]) -> ModuleType:
+    module = ModuleType(name)
+    module.__spec__ = importlib.machinery.ModuleSpec(name, None, is_package=True)
+    module.__spec__.submodule_search_locations = locations
+    module.__path__ = locations
+    return module
+
+
+def sibling_builtins(package: str, path: Path) -> dict[str, Any]:
+    """
+    Returns the builtins for the modules of `package`, with an `__import__`
+    that imports the modules in the package directory at `path` from the
+    package.
+    """
+    siblings: dict[str, bool] = {}
+
+    def is_sibling(name: str) -> bool:
+        if name not in siblings:
+            siblings[name] = (path / f"{name}.py").is_file() or (
+                path / name / "__init__.py"
+            ).is_file()
+        return siblings[name]
+
+    def __import__(name, globals=None, locals=None, fromlist=(), level=0):
+        top = name.partition(".")[0]
+        if level != 0 or not is_sibling(top):
+            return builtins.__import__(name, globals, locals, fromlist, level)
+        module = builtins.__import__(f"{package}.{name}", globals, locals, fromlist)
+        # `import utils.x` binds `utils`, `from utils.x import y` reads `y`
+        # from `utils.x`.
+        return module if fromlist else sys.modules[f"{package}.{top}"]
+
+    return dict(vars(builtins), __import__=__import__)
+
+
+class PackageLoader(importlib.machinery.SourceFileLoader):
+    def exec_module(self, module: ModuleType) -> None:
+        package = ".".join(module.__name__.split(".")[:2])
+        module.__builtins__ = package_builtins[package]  # type: ignore[attr-defined]
+        super().exec_module(module)
+
+
+class PackageFinder(importlib.abc.MetaPathFinder):
+    """
+    PackageFinder finds the modules of component packages in the package
+    directory, and loads them with the package's builtins.
+    """
+
+    def find_spec(
+        self, fullname: str, path: Optional[Any], target: Optional[ModuleType] = None
+    ) -> Optional[importlib.machinery.ModuleSpec]:
+        if not fullname.startswith(NAMESPACE + ".") or path is None:
+            return None
+        spec = importlib.machinery.PathFinder.find_spec(fullname, path)
+        if spec is None or not isinstance(
+            spec.loader, importlib.machinery.SourceFileLoader
+        ):
+            return spec
+        spec.loader = PackageLoader(fullname, spec.loader.path)
+        return spec
+
+
+finder = PackageFinder()
+
+
+def unload_package(path: Path) -> list[str]:
+    """
+    unload_package removes all the modules of the component package at `path`
+    from `sys.modules`, so that they can be garbage collected, or loaded again
+    from source. This includes modules of the package that were imported by
+    their plain name, from outside the package, but not the dependencies
+    installed in a virtualenv in the package directory. Returns the names of
+    the removed modules.
+    """
+    path = path.absolute()
+    package = package_namespace(path)
+    names = []
+    for name, module in list(sys.modules.items()):
+        file = getattr(module, "__file__", None)
+        if name == "__main__":
+            continue
+        if (
+            name == package
+            or name.startswith(package + ".")
+            or (file and is_package_file(Path(file), path))
+        ):
+            names.append(name)
+    for name in names:
+        del sys.modules[name]
+        registrations.pop(name, None)
+    package_builtins.pop(package, None)
+    return names
+
+
+def is_package_file(file: Path, path: Path) -> bool:
+    """
+    Whether `file` is a source file of the component package at `path`. Files
+    in site-packages and in hidden directories, like `.venv`, belong to the
+    package's dependencies instead.
+    """
+    if not file.is_relative_to(path):
+        return False
+    directories = file.relative_to(path).parts[:-1]
+    return not any(d.startswith(".") or d == "site-packages" for d in directories)
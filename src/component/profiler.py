@@ -0,0 +1,149 @@
+import builtins
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from types import ModuleType
+from typing import Any
+
+import pulumi
+
+from .analyzer import Analyzer, ComponentSchema
+from .metadata import Metadata
+
+
+@dataclass
+class ModuleProfile:
+    file: str
+    seconds: float
+    imports: dict[str, float] = field(default_factory=dict)
+    """Cumulative time of every module first imported while loading `file`."""
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "file": self.file,
+            "seconds": self.seconds,
+            "imports": self.imports,
+        }
+
+
+@dataclass
+class ProfileReport:
+    modules: list[ModuleProfile]
+    components: dict[str, float]
+    docstrings_seconds: float
+    total_seconds: float
+    peak_memory_bytes: int
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "modules": [m.to_json() for m in self.modules],
+            "components": self.components,
+            "docstringsSeconds": self.docstrings_seconds,
+            "totalSeconds": self.total_seconds,
+            "peakMemoryBytes": self.peak_memory_bytes,
+        }
+
+    def to_table(self, top: int = 10) -> str:
+        """
+        to_table renders the report sorted by time, slowest first. Only the
+        `top` slowest transitive imports are listed for each module.
+        """
+        lines = [f"{'module':<50} {'ms':>10}"]
+        for m in sorted(self.modules, key=lambda m: m.seconds, reverse=True):
+            lines.append(f"{m.file:<50} {m.seconds * 1000:>10.1f}")
+            imports = sorted(m.imports.items(), key=lambda i: i[1], reverse=True)
+            for name, seconds in imports[:top]:
+                lines.append(f"  {name:<48} {seconds * 1000:>10.1f}")
+        lines.append("")
+        lines.append(f"{'component':<50} {'ms':>10}")
+        components = sorted(self.components.items(), key=lambda c: c[1], reverse=True)
+        for name, seconds in components:
+            lines.append(f"{name:<50} {seconds * 1000:>10.1f}")
+        lines.append("")
+        lines.append(f"{'docstrings':<50} {self.docstrings_seconds * 1000:>10.1f}")
+        lines.append(f"{'total':<50} {self.total_seconds * 1000:>10.1f}")
+        peak = self.peak_memory_bytes / (1024 * 1024)
+        lines.append(f"{'peak memory (MiB)':<50} {peak:>10.1f}")
+        return "\n".join(lines)
+
+
+class ProfilingAnalyzer(Analyzer):
+    """
+    ProfilingAnalyzer is an Analyzer that records how long it spends
+    importing user modules, analyzing components and parsing docstrings.
+    """
+
+    def __init__(self, metadata: Metadata, path: Path):
+        super().__init__(metadata, path)
+        self.modules: list[ModuleProfile] = []
+        self.components: dict[str, float] = {}
+        self.docstrings_seconds = 0.0
+
+    def load_module(self, file_path: Path) -> ModuleType:
+        profile = ModuleProfile(file=file_path.name, seconds=0.0)
+        original_import = builtins.__import__
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if level != 0 or name in sys.modules:
+                return original_import(name, globals, locals, fromlist, level)
+            start = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                profile.imports[name] = time.perf_counter() - start
+
+        builtins.__import__ = timed_import
+        start = time.perf_counter()
+        try:
+            return super().load_module(file_path)
+        finally:
+            profile.seconds = time.perf_counter() - start
+            builtins.__import__ = original_import
+            self.modules.append(profile)
+
+    def analyze_component(
+        self,
+        component: type[pulumi.ComponentResource],
+    ) -> ComponentSchema:
+        start = time.perf_counter()
+        try:
+            return super().analyze_component(component)
+        finally:
+            name = self.arg_name(component.__name__)
+            self.components[name] = (
+                self.components.get(name, 0.0) + time.perf_counter() - start
+            )
+
+    def find_docstrings(self) -> dict[str, dict[str, str]]:
+        # Reading and parsing the files usually takes longer than walking the
+        # trees, so time both.
+        start = time.perf_counter()
+        try:
+            return super().find_docstrings()
+        finally:
+            self.docstrings_seconds += time.perf_counter() - start
+
+
+def profile(metadata: Metadata, path: Path) -> ProfileReport:
+    """
+    profile runs the analysis of the component package at `path` and reports
+    where the time and memory went.
+    """
+    a = ProfilingAnalyzer(metadata, path)
+    tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        a.analyze()
+        total = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return ProfileReport(
+        modules=a.modules,
+        components=a.components,
+        docstrings_seconds=a.docstrings_seconds,
+        total_seconds=total,
+        peak_memory_bytes=peak,
+    )
@@ -1,28 +1,157 @@
-import json
+import threading
 from pathlib import Path
-from typing import Any, Optional, cast
+from typing import Optional
 
 import pulumi
-from pulumi.provider import ConstructResult, Provider  # ParameterizeResult
+from pulumi.provider import ConstructResult, Provider
 
-from .analyzer import Analyzer
-from .metadata import Metadata
-from .schema import generate_schema
-from .util import python_name
+from .metadata import Metadata, read_metadata
+from .registry import ComponentRegistry, RegisteredComponent, RegistryCache
+from .schema import Parameterization
 
 
 class ComponentProvider(Provider):
+    """
+    ComponentProvider serves the component package at `path`.
+
+    When parameterized with the path of another component package, the same
+    provider process serves that package too. Analyzed packages are kept in a
+    RegistryCache bounded by `max_packages` and `max_schema_bytes`. See
+    `server.py` for the Parameterize RPC.
+
+    With `warm_up` set, the package at `path` is analyzed in the background,
+    so that the provider can start serving requests right away.
+
+    With `isolated_analysis` set, packages are analyzed in a subprocess, and
+    only the modules of the components that are constructed are imported.
+    """
+
     path: Path
 
-    def __init__(self, metadata: Metadata, path: Path) -> None:
+    def __init__(
+        self,
+        metadata: Metadata,
+        path: Path,
+        dedupe_types: bool = False,
+        max_packages: int = 8,
+        max_schema_bytes: Optional[int] = None,
+        warm_up: bool = False,
+        isolated_analysis: bool = False,
+    ) -> None:
         self.path = path
         self.metadata = metadata
-        schema = generate_schema(metadata, path)
-        super().__init__(metadata.version, json.dumps(schema.to_json()))
+        self.dedupe_types = dedupe_types
+        self.isolated_analysis = isolated_analysis
+        self.registry = ComponentRegistry(
+            metadata,
+            path,
+            dedupe_types=dedupe_types,
+            background=warm_up,
+            isolated=isolated_analysis,
+        )
+        # The name and version of the package we were last parameterized with,
+        # for `schema`. GetSchema requests name the package they want instead.
+        # We don't hold on to its registry, so that it can be freed once it's
+        # evicted.
+        self.current: Optional[tuple[str, str]] = None
+        self.registries = RegistryCache(max_packages, max_schema_bytes)
+        # Package name and version to package path of every parameterization
+        # we've seen, so that we can analyze evicted packages again when needed.
+        self.packages: dict[tuple[str, str], Path] = {}
+        # Package name to the version it was last parameterized with. Construct
+        # requests only carry the package name.
+        self.versions: dict[str, str] = {}
+        self.lock = threading.Lock()
+        # Package path to the lock held while analyzing the package, so that
+        # concurrent requests for the same package only analyze it once.
+        self.package_locks: dict[Path, threading.Lock] = {}
+        super().__init__(metadata.version)
+
+    @property
+    def schema(self) -> Optional[str]:  # type: ignore[override]
+        if self.current is None:
+            return self.registry.schema
+        return self.registry_for_package(*self.current).schema
+
+    @schema.setter
+    def schema(self, value: Optional[str]) -> None:
+        # Provider.__init__ sets the schema, but ours comes from the registry.
+        pass
+
+    def parameterize_args(self, args: list[str]) -> Metadata:
+        if len(args) != 1:
+            raise Exception("Expected the path to a component package as argument")
+        return self.parameterize(Path(args[0]).absolute())
+
+    def parameterize_value(
+        self, name: str, version: str, value: bytes
+    ) -> Metadata:
+        return self.parameterize(Path(value.decode()))
+
+    def parameterize(self, path: Path) -> Metadata:
+        """
+        parameterize analyzes the component package at `path`, and returns its
+        name and version.
+        """
+        registry = self.parameterized_registry(path)
+        with self.lock:
+            self.versions[registry.metadata.name] = registry.metadata.version
+            self.current = (registry.metadata.name, registry.metadata.version)
+        return registry.metadata
+
+    def parameterized_registry(self, path: Path) -> ComponentRegistry:
+        with self.lock:
+            lock = self.package_locks.setdefault(path, threading.Lock())
+        with lock:
+            registry = self.registries.get(path)
+            if registry is None:
+                metadata = read_metadata(path)
+                registry = ComponentRegistry(
+                    metadata,
+                    path,
+                    dedupe_types=self.dedupe_types,
+                    isolated=self.isolated_analysis,
+                    parameterization=Parameterization(
+                        base_provider_name=self.metadata.name,
+                        base_provider_version=self.metadata.version,
+                        parameter=str(path).encode(),
+                    ),
+                )
+                self.registries.put(path, registry)
+                with self.lock:
+                    self.packages[(metadata.name, metadata.version)] = path
+        return registry
+
+    def registry_for(self, resource_type: str) -> ComponentRegistry:
+        return self.registry_for_package(resource_type.split(":")[0])
+
+    def registry_for_package(
+        self, package: str, version: Optional[str] = None
+    ) -> ComponentRegistry:
+        """
+        registry_for_package returns the registry of `package` at `version`,
+        or at the version it was last parameterized with if `version` is not
+        set, and analyzes the package again if it was evicted.
+        """
+        if package == self.metadata.name and version in (None, self.metadata.version):
+            return self.registry
+        with self.lock:
+            if version is None:
+                version = self.versions.get(package)
+            path = self.packages.get((package, version or ""))
+        if path is None:
+            if version:
+                raise Exception(f"Unknown package {package} version {version}")
+            raise Exception(f"Unknown package {package}")
+        return self.parameterized_registry(path)
 
-    # Needs implementation in the core SDK.
-    # def parameterize_args(self, args: list[str]) -> ParameterizeResult:
-    #     return ParameterizeResult(name=self.name, version=self.version)
+    def find_component(self, resource_type: str) -> RegisteredComponent:
+        """
+        find_component returns the component `resource_type`, and waits until
+        it has been analyzed if needed.
+        """
+        registry = self.registry_for(resource_type)
+        return registry.find_component(resource_type.split(":")[-1])
 
     def construct(
         self,
@@ -31,13 +160,5 @@ class ComponentProvider(Provider):
         inputs: pulumi.Inputs,
         options: Optional[pulumi.ResourceOptions] = None,
     ) -> ConstructResult:
-        a = Analyzer(self.metadata, self.path)
-        component_name = resource_type.split(":")[-1]
-        comp, comp_args = a.find_component(component_name)
-        args = comp_args(**{python_name(k): v for k, v in inputs.items()})
-        comp_instance = cast(Any, comp)(name, args, options)
-        keys = a.analyze_component_outputs(type(comp_instance))
-        state = {
-            a.arg_name(k): getattr(comp_instance, python_name(k), None) for k in keys
-        }
-        return ConstructResult(comp_instance.urn, state)
+        registry = self.registry_for(resource_type)
+        return registry.construct(name, resource_type, inputs, options)
@@ -0,0 +1,238 @@
+import cProfile
+import json
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional
+
+import grpc
+from google.protobuf import json_format, struct_pb2
+from pulumi.runtime import rpc
+from pulumi.runtime._grpc_settings import _GRPC_CHANNEL_OPTIONS
+from pulumi.runtime.proto import provider_pb2, provider_pb2_grpc
+
+from .loadtest import start_fakes
+from .provider import ComponentProvider
+from .server import ComponentProviderServicer
+
+# Records the Construct requests a provider receives, with how long they took,
+# and replays them against a provider offline, with a fake engine and resource
+# monitor in place of the Pulumi engine.
+#
+# A recording is a JSON lines file with one construct per line. The requests
+# are stored as they arrive, including their inputs and the stack's config,
+# except that the values of secret config and secret inputs are redacted,
+# unless the recorder is told to keep them.
+
+REDACTED = "[secret]"
+
+
+@dataclass
+class ConstructRecord:
+    request: provider_pb2.ConstructRequest
+    seconds: float
+    """How long the provider took to handle the request."""
+    error: Optional[str] = None
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "request": json_format.MessageToDict(self.request),
+            "seconds": self.seconds,
+            "error": self.error,
+        }
+
+    @staticmethod
+    def from_json(data: dict[str, Any]) -> "ConstructRecord":
+        return ConstructRecord(
+            request=json_format.ParseDict(
+                data["request"], provider_pb2.ConstructRequest()
+            ),
+            seconds=data["seconds"],
+            error=data.get("error"),
+        )
+
+
+def redact_secrets(
+    request: provider_pb2.ConstructRequest,
+) -> provider_pb2.ConstructRequest:
+    """
+    Returns a copy of `request` with the values of its secret config and
+    secret inputs replaced by REDACTED. Secret inputs stay marked as secrets.
+    """
+    redacted = provider_pb2.ConstructRequest()
+    redacted.CopyFrom(request)
+    for key in redacted.configSecretKeys:
+        if key in redacted.config:
+            redacted.config[key] = REDACTED
+    for value in redacted.inputs.fields.values():
+        redact_value(value)
+    return redacted
+
+
+def redact_value(value: struct_pb2.Value) -> None:
+    kind = value.WhichOneof("kind")
+    if kind == "list_value":
+        for item in value.list_value.values:
+            redact_value(item)
+        return
+    if kind != "struct_value":
+        return
+    fields = value.struct_value.fields
+    if is_secret(value.struct_value):
+        if "value" in fields:
+            fields["value"].string_value = REDACTED
+        return
+    for field in fields.values():
+        redact_value(field)
+
+
+def is_secret(struct: struct_pb2.Struct) -> bool:
+    """
+    Whether `struct` is a serialized secret, or a serialized output value that
+    is secret. The SDK only has public helpers for deserialized values, so we
+    check the signatures `pulumi.runtime.rpc` serializes them with.
+    """
+    fields = struct.fields
+    if rpc._special_sig_key not in fields:
+        return False
+    sig = fields[rpc._special_sig_key].string_value
+    if sig == rpc._special_secret_sig:
+        return True
+    return (
+        sig == rpc._special_output_value_sig
+        and "secret" in fields
+        and fields["secret"].bool_value
+    )
+
+
+class Recorder:
+    """
+    Recorder appends Construct requests to the recording at `path`. Every
+    record is written right away, so that a recording survives the provider
+    being killed.
+
+    The values of secret config and secret inputs are redacted, unless
+    `keep_secrets` is set.
+    """
+
+    def __init__(self, path: Path, keep_secrets: bool = False) -> None:
+        self.path = path
+        self.keep_secrets = keep_secrets
+        self.lock = threading.Lock()
+
+    def record(self, record: ConstructRecord) -> None:
+        if not self.keep_secrets:
+            record = ConstructRecord(
+                redact_secrets(record.request), record.seconds, record.error
+            )
+        line = json.dumps(record.to_json())
+        with self.lock:
+            with open(self.path, "a") as f:
+                f.write(line + "\n")
+
+
+class RecordingServicer(ComponentProviderServicer):
+    def __init__(
+        self,
+        provider: ComponentProvider,
+        args: list[str],
+        engine_address: str,
+        recorder: Recorder,
+    ) -> None:
+        super().__init__(provider, args, engine_address)
+        self.recorder = recorder
+
+    async def Construct(
+        self, request: provider_pb2.ConstructRequest, context
+    ) -> provider_pb2.ConstructResponse:
+        start = time.perf_counter()
+        error = None
+        try:
+            return await super().Construct(request, context)
+        except BaseException as e:
+            error = f"{type(e).__name__}: {e}"
+            raise
+        finally:
+            self.recorder.record(
+                ConstructRecord(request, time.perf_counter() - start, error)
+            )
+
+
+def read_recording(path: Path) -> list[ConstructRecord]:
+    with open(path) as f:
+        return [ConstructRecord.from_json(json.loads(line)) for line in f if line.strip()]
+
+
+@dataclass
+class ReplayResult:
+    resource_type: str
+    name: str
+    recorded_seconds: float
+    seconds: float
+    error: Optional[str] = None
+
+
+async def replay(
+    provider: ComponentProvider,
+    records: list[ConstructRecord],
+    profiler: Optional[cProfile.Profile] = None,
+) -> list[ReplayResult]:
+    """
+    replay sends the recorded Construct requests to `provider` one after the
+    other, in the order they were recorded. The requests go to a fake resource
+    monitor, which accepts every resource registration.
+
+    With a `profiler`, it is enabled while each request is handled.
+    """
+    fakes, _, address = start_fakes(max_workers=4)
+    server = grpc.aio.server(options=_GRPC_CHANNEL_OPTIONS)
+    servicer = ComponentProviderServicer(provider, [], address)
+    provider_pb2_grpc.add_ResourceProviderServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+
+    results = []
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = provider_pb2_grpc.ResourceProviderStub(channel)
+            for record in records:
+                request = provider_pb2.ConstructRequest()
+                request.CopyFrom(record.request)
+                request.monitorEndpoint = address
+                error = None
+                if profiler:
+                    profiler.enable()
+                start = time.perf_counter()
+                try:
+                    await stub.Construct(request)
+                except grpc.aio.AioRpcError as e:
+                    error = e.details()
+                finally:
+                    seconds = time.perf_counter() - start
+                    if profiler:
+                        profiler.disable()
+                results.append(
+                    ReplayResult(
+                        resource_type=request.type,
+                        name=request.name,
+                        recorded_seconds=record.seconds,
+                        seconds=seconds,
+                        error=error,
+                    )
+                )
+    finally:
+        await server.stop(None)
+        fakes.stop(None)
+    return results
+
+
+def format_replay(results: list[ReplayResult]) -> str:
+    lines = [f"{'type':<40} {'name':<20} {'recorded ms':>12} {'replay ms':>10}  error"]
+    for r in results:
+        error = (r.error or "").splitlines()[0] if r.error else ""
+        lines.append(
+            f"{r.resource_type:<40} {r.name:<20} {r.recorded_seconds * 1000:>12.1f} "
+            f"{r.seconds * 1000:>10.1f}  {error}".rstrip()
+        )
+    return "\n".join(lines)
@@ -0,0 +1,54 @@
+import sys
+from dataclasses import dataclass
+from typing import Optional, TypeVar
+
+import pulumi
+
+
+@dataclass
+class ComponentRegistration:
+    component: type[pulumi.ComponentResource]
+    args: Optional[type]
+    file: Optional[str]
+    """The file of the module that defines the component."""
+    line: Optional[int]
+
+
+# Module name to the components registered by that module, in definition
+# order. The analyzer reads this instead of scanning the module's attributes.
+registrations: dict[str, list[ComponentRegistration]] = {}
+
+C = TypeVar("C", bound=type[pulumi.ComponentResource])
+
+
+def register_component(cls: C) -> C:
+    """
+    register_component is a class decorator that registers a component with
+    the analyzer when the class is created.
+    """
+    module = sys.modules.get(cls.__module__)
+    init = getattr(cls.__init__, "__code__", None)
+    registration = ComponentRegistration(
+        component=cls,
+        args=cls.__init__.__annotations__.get("args"),
+        file=getattr(module, "__file__", None),
+        line=getattr(cls, "__firstlineno__", init.co_firstlineno if init else None),
+    )
+    registrations.setdefault(cls.__module__, []).append(registration)
+    return cls
+
+
+class Component(pulumi.ComponentResource):
+    """
+    Component is a base class for components that registers every subclass
+    with the analyzer, including subclasses of subclasses. Pass
+    `register=False` to skip an intermediate base class:
+
+        class Base(Component, register=False):
+            ...
+    """
+
+    def __init_subclass__(cls, register: bool = True, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if register:
+            register_component(cls)
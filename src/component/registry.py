@@ -0,0 +1,234 @@
+import json
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Optional, cast
+
+import pulumi
+from pulumi.provider import ConstructResult
+
+from .analyzer import Analyzer, ComponentSchema
+from .metadata import Metadata
+from .modules import unload_package
+from .schema import Parameterization, package_spec
+from .util import python_name
+from .validation import InputsValidator, InputValidationError, compile_validator
+from .worker import analyze_in_subprocess
+
+
+@dataclass
+class RegisteredComponent:
+    component: type[pulumi.ComponentResource]
+    args: type
+    outputs: list[str]
+    """The schema names of the outputs of the component."""
+    validator: InputsValidator
+
+
+class ComponentRegistry:
+    """
+    ComponentRegistry holds the schema and the component classes of an
+    analyzed component package, and constructs its components.
+
+    With `background` set, the package is analyzed in a background thread.
+    `construct` only waits until the component it needs has been analyzed,
+    reading `schema` waits until the whole package has been analyzed.
+
+    With `isolated` set, the package is analyzed in a subprocess, see
+    `worker.py`, and the modules of a component are only loaded the first time
+    it is constructed.
+    """
+
+    def __init__(
+        self,
+        metadata: Metadata,
+        path: Path,
+        dedupe_types: bool = False,
+        parameterization: Optional[Parameterization] = None,
+        background: bool = False,
+        isolated: bool = False,
+    ) -> None:
+        self.metadata = metadata
+        self.path = path
+        self.dedupe_types = dedupe_types
+        self.parameterization = parameterization
+        self.isolated = isolated
+        self.analyzer = Analyzer(metadata, path)
+        self.components: dict[str, RegisteredComponent] = {}
+        # Where to load the components from that haven't been registered yet.
+        self.index: dict[str, tuple[Path, str]] = {}
+        self.schema_json: Optional[str] = None
+        self.error: Optional[BaseException] = None
+        self.done = False
+        self.ready = threading.Condition()
+        if background:
+            threading.Thread(target=self.load, daemon=True).start()
+        else:
+            self.load()
+            if self.error:
+                raise self.error
+
+    def load(self) -> None:
+        """
+        load analyzes the package file by file, and registers the components
+        of each file as soon as the file has been analyzed.
+        """
+        try:
+            if self.isolated:
+                self.load_isolated()
+                return
+            a = self.analyzer
+            a.docstrings = a.find_docstrings()
+            components: dict[str, ComponentSchema] = {}
+            for file_path in a.python_files():
+                comps = a.analyze_file(file_path)
+                for name, schema in comps.items():
+                    self.register(name, a.component_classes[name], schema)
+                components.update(comps)
+            a.merge_same_named_types(components)
+            if self.dedupe_types:
+                a.dedupe_type_definitions(components)
+            spec = package_spec(self.metadata, components, a.type_definitions)
+            spec.parameterization = self.parameterization
+            schema_json = json.dumps(spec.to_json())
+            with self.ready:
+                self.schema_json = schema_json
+        except BaseException as e:
+            with self.ready:
+                self.error = e
+        finally:
+            with self.ready:
+                self.done = True
+                self.ready.notify_all()
+
+    def load_isolated(self) -> None:
+        spec, index = analyze_in_subprocess(
+            self.metadata, self.path, dedupe_types=self.dedupe_types
+        )
+        if self.parameterization:
+            spec["parameterization"] = self.parameterization.to_json()
+        schema_json = json.dumps(spec)
+        with self.ready:
+            self.index = index
+            self.schema_json = schema_json
+
+    def register(
+        self,
+        name: str,
+        comp: type[pulumi.ComponentResource],
+        schema: ComponentSchema,
+    ) -> None:
+        entry = RegisteredComponent(
+            component=comp,
+            args=comp.__init__.__annotations__.get("args"),
+            outputs=list(schema.outputs.keys()),
+            validator=compile_validator(schema, self.analyzer.type_definitions),
+        )
+        with self.ready:
+            self.components[name] = entry
+            self.ready.notify_all()
+
+    @property
+    def schema(self) -> str:
+        with self.ready:
+            self.ready.wait_for(lambda: self.done)
+        if self.error:
+            raise self.error
+        return cast(str, self.schema_json)
+
+    @property
+    def schema_size(self) -> int:
+        """
+        The size of the schema in bytes. This grows with the number of
+        components and types in the package, but doesn't account for the
+        memory held by the package's modules.
+        """
+        return len(self.schema)
+
+    def find_component(self, name: str) -> RegisteredComponent:
+        with self.ready:
+            self.ready.wait_for(lambda: name in self.components or self.done)
+            if name in self.components:
+                return self.components[name]
+        if self.error:
+            raise self.error
+        if name in self.index:
+            file_path, attribute = self.index[name]
+            comp = getattr(self.analyzer.load_module(file_path), attribute)
+        else:
+            # Not one of the components found while analyzing the package, look
+            # it up by name.
+            comp, _ = self.analyzer.find_component(name)
+        self.register(name, comp, self.analyzer.analyze_component(comp))
+        return self.components[name]
+
+    def construct(
+        self,
+        name: str,
+        resource_type: str,
+        inputs: pulumi.Inputs,
+        options: Optional[pulumi.ResourceOptions] = None,
+    ) -> ConstructResult:
+        component_name = resource_type.split(":")[-1]
+        entry = self.find_component(component_name)
+        errors = entry.validator(inputs)
+        if errors:
+            raise InputValidationError(resource_type, errors)
+        args = entry.args(**{python_name(k): v for k, v in inputs.items()})
+        comp_instance = cast(Any, entry.component)(name, args, options)
+        state = {
+            k: getattr(comp_instance, python_name(k), None) for k in entry.outputs
+        }
+        return ConstructResult(comp_instance.urn, state)
+
+
+class RegistryCache:
+    """
+    RegistryCache is a least recently used cache of ComponentRegistries, keyed
+    by the path of the component package.
+
+    Once there are more than `max_entries` registries, or the combined size of
+    their schemas exceeds `max_schema_bytes`, the least recently used
+    registries are evicted. The most recently added registry is never evicted.
+    The cache can be used from several threads.
+    """
+
+    def __init__(self, max_entries: int = 8, max_schema_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_schema_bytes = max_schema_bytes
+        self.entries: OrderedDict[Path, ComponentRegistry] = OrderedDict()
+        self.schema_bytes = 0
+        self.lock = threading.RLock()
+
+    def get(self, path: Path) -> Optional[ComponentRegistry]:
+        with self.lock:
+            registry = self.entries.get(path)
+            if registry is not None:
+                self.entries.move_to_end(path)
+            return registry
+
+    def put(self, path: Path, registry: ComponentRegistry) -> None:
+        # Reading the schema size waits for the analysis, do it before locking.
+        schema_size = registry.schema_size
+        with self.lock:
+            if path in self.entries:
+                self.schema_bytes -= self.entries.pop(path).schema_size
+            self.entries[path] = registry
+            self.schema_bytes += schema_size
+            while len(self.entries) > 1 and self.over_limit():
+                self.evict(next(iter(self.entries)))
+
+    def evict(self, path: Path) -> None:
+        with self.lock:
+            registry = self.entries.pop(path)
+            self.schema_bytes -= registry.schema_size
+            unload_package(registry.path)
+
+    def over_limit(self) -> bool:
+        if len(self.entries) > self.max_entries:
+            return True
+        return (
+            self.max_schema_bytes is not None
+            and self.schema_bytes > self.max_schema_bytes
+        )
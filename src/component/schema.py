@@ -1,9 +1,10 @@
+import base64
 from dataclasses import dataclass
 from enum import Enum
 from pathlib import Path
 from typing import Any, Optional
 
-from .analyzer import Analyzer, SchemaProperty, TypeDefinition
+from .analyzer import Analyzer, ComponentSchema, SchemaProperty, TypeDefinition
 from .metadata import Metadata
 
 
@@ -110,6 +111,39 @@ class Resource:
             "required": self.required,
         }
 
+    @staticmethod
+    def from_analyzer(component: ComponentSchema) -> "Resource":
+        return Resource(
+            is_component=True,
+            type_=BuiltinType.OBJECT,
+            input_properties={
+                k: Property.from_analyzer(property)
+                for k, property in component.inputs.items()
+            },
+            required_inputs=required(component.inputs),
+            properties={
+                k: Property.from_analyzer(property)
+                for k, property in component.outputs.items()
+            },
+            required=required(component.outputs),
+        )
+
+
+@dataclass
+class Parameterization:
+    base_provider_name: str
+    base_provider_version: str
+    parameter: bytes
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "baseProvider": {
+                "name": self.base_provider_name,
+                "version": self.base_provider_version,
+            },
+            "parameter": base64.b64encode(self.parameter).decode(),
+        }
+
 
 @dataclass
 class PackageSpec:
@@ -119,9 +153,10 @@ class PackageSpec:
     resources: dict[str, Resource]
     types: dict[str, ComplexType]
     language: dict[str, dict[str, Any]]
+    parameterization: Optional[Parameterization] = None
 
     def to_json(self) -> dict[str, Any]:
-        return {
+        spec = {
             "name": self.name,
             "displayName": self.displayName,
             "version": self.version,
@@ -129,6 +164,9 @@ class PackageSpec:
             "resources": {k: v.to_json() for k, v in self.resources.items()},
             "language": self.language,
         }
+        if self.parameterization:
+            spec["parameterization"] = self.parameterization.to_json()
+        return spec
 
 
 def type_to_str(typ: type) -> str:
@@ -143,52 +181,65 @@ def type_to_str(typ: type) -> str:
     return "object"
 
 
-def generate_schema(metadata: Metadata, path: Path) -> PackageSpec:
+def required(properties: dict[str, SchemaProperty]) -> list[str]:
+    return [k for k, prop in properties.items() if not prop.optional]
+
+
+def default_language() -> dict[str, dict[str, Any]]:
+    return {
+        "nodejs": {
+            "respectSchemaVersion": True,
+        },
+        "python": {
+            "respectSchemaVersion": True,
+        },
+        "csharp": {
+            "respectSchemaVersion": True,
+        },
+        "java": {
+            "respectSchemaVersion": True,
+        },
+        "go": {
+            "respectSchemaVersion": True,
+        },
+    }
+
+
+def generate_schema(
+    metadata: Metadata, path: Path, dedupe_types: bool = False
+) -> PackageSpec:
+    """
+    generate_schema analyzes the components at `path` and returns the package
+    schema. If `dedupe_types` is set, structurally identical types are merged
+    into a single type.
+    """
+    a = Analyzer(metadata, path)
+    components = a.analyze()
+    if dedupe_types:
+        a.dedupe_type_definitions(components)
+    return package_spec(metadata, components, a.type_definitions)
+
+
+def package_spec(
+    metadata: Metadata,
+    components: dict[str, ComponentSchema],
+    type_definitions: dict[str, TypeDefinition],
+) -> PackageSpec:
+    """
+    package_spec returns the package schema for already analyzed components.
+    """
     pkg = PackageSpec(
         name=metadata.name,
         version=metadata.version,
         displayName=metadata.display_name or metadata.name,
         resources={},
         types={},
-        language={
-            "nodejs": {
-                "respectSchemaVersion": True,
-            },
-            "python": {
-                "respectSchemaVersion": True,
-            },
-            "csharp": {
-                "respectSchemaVersion": True,
-            },
-            "java": {
-                "respectSchemaVersion": True,
-            },
-            "go": {
-                "respectSchemaVersion": True,
-            },
-        },
+        language=default_language(),
     )
-    a = Analyzer(metadata, path)
-    components = a.analyze()
     for component_name, component in components.items():
         schema_name = f"{metadata.name}:index:{component_name}"
-        pkg.resources[schema_name] = Resource(
-            is_component=True,
-            type_=BuiltinType.OBJECT,
-            input_properties={
-                k: Property.from_analyzer(property)
-                for k, property in component.inputs.items()
-            },
-            required_inputs=[
-                k for k, prop in component.inputs.items() if not prop.optional
-            ],
-            properties={
-                k: Property.from_analyzer(property)
-                for k, property in component.outputs.items()
-            },
-            required=[k for k, prop in component.outputs.items() if not prop.optional],
-        )
-    for type_name, type_ in a.type_definitions.items():
+        pkg.resources[schema_name] = Resource.from_analyzer(component)
+    for type_name, type_ in type_definitions.items():
         pkg.types[f"{metadata.name}:index:{type_name}"] = ComplexType.from_analyzer(
             type_
         )
@@ -0,0 +1,62 @@
+import json
+from pathlib import Path
+from typing import Optional, TextIO
+
+from .analyzer import Analyzer, ComponentSchema, TypeDefinition
+from .metadata import Metadata
+from .schema import ComplexType, Parameterization, Resource, default_language
+
+# write_schema produces the same JSON as `json.dumps(PackageSpec.to_json())`,
+# but writes it to `f` one type and one resource at a time, without building
+# the PackageSpec or the full JSON string in memory. Resources and types are
+# written sorted by their token.
+
+
+def write_schema(
+    metadata: Metadata,
+    components: dict[str, ComponentSchema],
+    type_definitions: dict[str, TypeDefinition],
+    f: TextIO,
+    parameterization: Optional[Parameterization] = None,
+) -> None:
+    f.write("{")
+    f.write(f'"name": {json.dumps(metadata.name)}, ')
+    f.write(f'"displayName": {json.dumps(metadata.display_name or metadata.name)}, ')
+    f.write(f'"version": {json.dumps(metadata.version)}, ')
+
+    f.write('"types": {')
+    for i, type_name in enumerate(sorted(type_definitions)):
+        if i > 0:
+            f.write(", ")
+        f.write(f"{json.dumps(f'{metadata.name}:index:{type_name}')}: ")
+        json.dump(ComplexType.from_analyzer(type_definitions[type_name]).to_json(), f)
+    f.write("}, ")
+
+    f.write('"resources": {')
+    for i, component_name in enumerate(sorted(components)):
+        if i > 0:
+            f.write(", ")
+        f.write(f"{json.dumps(f'{metadata.name}:index:{component_name}')}: ")
+        json.dump(Resource.from_analyzer(components[component_name]).to_json(), f)
+    f.write("}, ")
+
+    f.write('"language": ')
+    json.dump(default_language(), f)
+    if parameterization:
+        f.write(', "parameterization": ')
+        json.dump(parameterization.to_json(), f)
+    f.write("}")
+
+
+def emit_schema(
+    metadata: Metadata, path: Path, f: TextIO, dedupe_types: bool = False
+) -> None:
+    """
+    emit_schema analyzes the components at `path` and streams the package
+    schema to `f`.
+    """
+    a = Analyzer(metadata, path)
+    components = a.analyze()
+    if dedupe_types:
+        a.dedupe_type_definitions(components)
+    write_schema(metadata, components, a.type_definitions, f)
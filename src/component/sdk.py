@@ -0,0 +1,247 @@
+from pathlib import Path
+from typing import Optional
+
+from .analyzer import Analyzer, ComponentSchema, SchemaProperty, TypeDefinition
+from .metadata import Metadata
+from .util import python_name
+
+# Generates a Python SDK for a component package directly from the analyzer's
+# results, without going through the JSON schema and `pulumi package gen-sdk`.
+#
+# Object types become `@pulumi.input_type` args classes. Components become
+# remote ComponentResources. Object typed outputs are returned as plain
+# dictionaries.
+
+HEADER = "# *** Generated by component.sdk, do not edit by hand. ***\n"
+
+
+def generate_sdk(
+    metadata: Metadata,
+    components: dict[str, ComponentSchema],
+    type_definitions: dict[str, TypeDefinition],
+    out: Path,
+) -> list[Path]:
+    """
+    generate_sdk writes the SDK for the analyzed components to `out`. Only the
+    files whose content changed are written, and generated files for
+    components that no longer exist are removed. Returns the written files.
+    """
+    package = package_name(metadata)
+    files: dict[Path, str] = {
+        out / "pyproject.toml": pyproject(metadata),
+        out / package / "_types.py": types_module(type_definitions),
+    }
+    modules = []
+    for name, component in sorted(components.items()):
+        module = python_name(name)
+        modules.append(module)
+        files[out / package / f"{module}.py"] = component_module(
+            metadata, name, component
+        )
+    files[out / package / "__init__.py"] = init_module(modules)
+
+    written = []
+    for path, content in files.items():
+        if write_if_changed(path, content):
+            written.append(path)
+    for path in (out / package).glob("*.py"):
+        if path not in files and path.read_text().startswith(HEADER):
+            path.unlink()
+    return written
+
+
+def gen_sdk(metadata: Metadata, path: Path, out: Path) -> list[Path]:
+    """
+    gen_sdk analyzes the components at `path` and writes their SDK to `out`.
+    """
+    a = Analyzer(metadata, path)
+    components = a.analyze()
+    return generate_sdk(metadata, components, a.type_definitions, out)
+
+
+def package_name(metadata: Metadata) -> str:
+    return "pulumi_" + metadata.name.replace("-", "_")
+
+
+def write_if_changed(path: Path, content: str) -> bool:
+    if path.exists() and path.read_text() == content:
+        return False
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return True
+
+
+def pyproject(metadata: Metadata) -> str:
+    return f"""[project]
+name = "{package_name(metadata)}"
+version = "{metadata.version}"
+dependencies = ["pulumi>=3.145.0"]
+
+[build-system]
+requires = ["hatchling"]
+build-backend = "hatchling.build"
+"""
+
+
+def init_module(modules: list[str]) -> str:
+    lines = [HEADER, "from ._types import *"]
+    lines.extend(f"from .{module} import *" for module in modules)
+    return "\n".join(lines) + "\n"
+
+
+def types_module(type_definitions: dict[str, TypeDefinition]) -> str:
+    names = sorted(type_definitions)
+    lines = [
+        HEADER,
+        "from typing import Any, Optional",
+        "",
+        "import pulumi",
+        "",
+        f"__all__ = {[args_class_name(name) for name in names]!r}",
+    ]
+    for name in names:
+        type_def = type_definitions[name]
+        lines.extend(["", ""])
+        lines.extend(args_class(args_class_name(name), type_def.properties))
+    return "\n".join(lines) + "\n"
+
+
+def component_module(
+    metadata: Metadata, name: str, component: ComponentSchema
+) -> str:
+    args_name = f"{name}Args"
+    token = f"{metadata.name}:index:{name}"
+    outputs = {python_name(k): k for k in component.outputs}
+    names = {python_name(k): k for k in component.inputs} | outputs
+    lines = [
+        HEADER,
+        "from typing import Any, Mapping, Optional",
+        "",
+        "import pulumi",
+        "",
+        "from ._types import *",
+        "",
+        f"__all__ = [{args_name!r}, {name!r}]",
+        "",
+        f"_PY_TO_PULUMI = {names!r}",
+        "_PULUMI_TO_PY = {v: k for k, v in _PY_TO_PULUMI.items()}",
+        "",
+        "",
+    ]
+    lines.extend(args_class(args_name, component.inputs))
+    lines.extend(["", "", f"class {name}(pulumi.ComponentResource):"])
+    if component.description:
+        lines.append(f"    {docstring(component.description, 4)}")
+        lines.append("")
+    for py_name, k in outputs.items():
+        prop = component.outputs[k]
+        lines.append(f"    {py_name}: pulumi.Output[{output_annotation(prop)}]")
+    if outputs:
+        lines.append("")
+    lines.extend(
+        [
+            "    def __init__(",
+            "        self,",
+            "        resource_name: str,",
+            f"        args: {args_name},",
+            "        opts: Optional[pulumi.ResourceOptions] = None,",
+            "    ) -> None:",
+            "        props: dict[str, Any] = {",
+        ]
+    )
+    for k in component.inputs:
+        lines.append(f"            {python_name(k)!r}: args.{python_name(k)},")
+    for py_name in outputs:
+        if outputs[py_name] not in component.inputs:
+            lines.append(f"            {py_name!r}: None,")
+    lines.extend(
+        [
+            "        }",
+            f"        super().__init__({token!r}, resource_name, props, opts, remote=True)",
+            "",
+            "    def translate_output_property(self, prop: str) -> str:",
+            "        return _PULUMI_TO_PY.get(prop, prop)",
+            "",
+            "    def translate_input_property(self, prop: str) -> str:",
+            "        return _PY_TO_PULUMI.get(prop, prop)",
+        ]
+    )
+    return "\n".join(lines) + "\n"
+
+
+def args_class(class_name: str, properties: dict[str, SchemaProperty]) -> list[str]:
+    # Required arguments first, Python doesn't allow them after optional ones.
+    ordered = sorted(properties.items(), key=lambda item: item[1].optional)
+    lines = ["@pulumi.input_type", f"class {class_name}:"]
+    params = []
+    for k, prop in ordered:
+        annotation = input_annotation(prop)
+        if prop.optional:
+            params.append(f"{python_name(k)}: Optional[{annotation}] = None")
+        else:
+            params.append(f"{python_name(k)}: {annotation}")
+    lines.append(f"    def __init__(__self__, *{''.join(', ' + p for p in params)}):")
+    if not ordered:
+        lines.append("        pass")
+    for k, prop in ordered:
+        py_name = python_name(k)
+        if prop.optional:
+            lines.append(f"        if {py_name} is not None:")
+            lines.append(f"            pulumi.set(__self__, {py_name!r}, {py_name})")
+        else:
+            lines.append(f"        pulumi.set(__self__, {py_name!r}, {py_name})")
+    for k, prop in ordered:
+        py_name = python_name(k)
+        annotation = input_annotation(prop)
+        if prop.optional:
+            annotation = f"Optional[{annotation}]"
+        lines.extend(
+            [
+                "",
+                "    @property",
+                f"    @pulumi.getter(name={k!r})",
+                f"    def {py_name}(self) -> {annotation}:",
+            ]
+        )
+        if prop.description:
+            lines.append(f"        {docstring(prop.description, 8)}")
+        lines.extend(
+            [
+                f"        return pulumi.get(self, {py_name!r})",
+                "",
+                f"    @{py_name}.setter",
+                f"    def {py_name}(self, value: {annotation}) -> None:",
+                f"        pulumi.set(self, {py_name!r}, value)",
+            ]
+        )
+    return lines
+
+
+def input_annotation(prop: SchemaProperty) -> str:
+    if prop.ref:
+        return f"pulumi.Input[{args_class_name(prop.ref.split(':')[-1])!r}]"
+    return f"pulumi.Input[{scalar_annotation(prop.type_)}]"
+
+
+def output_annotation(prop: SchemaProperty) -> str:
+    if prop.ref:
+        return "Mapping[str, Any]"
+    return scalar_annotation(prop.type_)
+
+
+def scalar_annotation(typ: Optional[type]) -> str:
+    if typ in (str, int, float, bool):
+        return typ.__name__  # type: ignore[union-attr]
+    return "Any"
+
+
+def args_class_name(type_name: str) -> str:
+    return f"{type_name}Args"
+
+
+def docstring(text: str, indent: int) -> str:
+    text = text.strip().replace('"""', '\\"\\"\\"')
+    if "\n" not in text:
+        return f'"""{text}"""'
+    body = "\n".join(" " * indent + line.strip() for line in text.splitlines())
+    return f'"""\n{body}\n{" " * indent}"""'
@@ -0,0 +1,101 @@
+import argparse
+import asyncio
+import sys
+from typing import Callable
+
+import grpc
+from pulumi.provider.server import ProviderServicer
+from pulumi.runtime._grpc_settings import _GRPC_CHANNEL_OPTIONS
+from pulumi.runtime.proto import provider_pb2, provider_pb2_grpc
+
+from .provider import ComponentProvider
+
+# The gRPC side of ComponentProvider. The core SDK's ProviderServicer doesn't
+# implement Parameterize, and calls into the provider on the event loop thread.
+# Reading the schema, or finding a component while the package is analyzed in
+# the background, blocks, so we serve the provider with our own servicer that
+# waits for those in a thread instead.
+
+
+class ComponentProviderServicer(ProviderServicer):
+    provider: ComponentProvider
+
+    def __init__(
+        self, provider: ComponentProvider, args: list[str], engine_address: str
+    ) -> None:
+        super().__init__(provider, args, engine_address=engine_address)
+
+    async def Parameterize(
+        self, request: provider_pb2.ParameterizeRequest, context
+    ) -> provider_pb2.ParameterizeResponse:
+        # Parameterizing analyzes the package, don't block the event loop.
+        if request.HasField("args"):
+            metadata = await asyncio.to_thread(
+                self.provider.parameterize_args, list(request.args.args)
+            )
+        else:
+            metadata = await asyncio.to_thread(
+                self.provider.parameterize_value,
+                request.value.name,
+                request.value.version,
+                request.value.value,
+            )
+        return provider_pb2.ParameterizeResponse(
+            name=metadata.name, version=metadata.version
+        )
+
+    async def Construct(
+        self, request: provider_pb2.ConstructRequest, context
+    ) -> provider_pb2.ConstructResponse:
+        # Wait until the component has been analyzed without blocking the
+        # event loop, so that constructs of components that are ready already
+        # go ahead in the meantime.
+        try:
+            await asyncio.to_thread(self.provider.find_component, request.type)
+        except Exception:
+            # construct raises the error again, and reports it.
+            pass
+        return await super().Construct(request, context)
+
+    async def GetSchema(
+        self, request: provider_pb2.GetSchemaRequest, context
+    ) -> provider_pb2.GetSchemaResponse:
+        if request.version != 0:
+            raise Exception(f"unsupported schema version {request.version}")
+
+        def schema() -> str:
+            if request.subpackage_name:
+                # Analyzes the package again if it was evicted.
+                return self.provider.registry_for_package(
+                    request.subpackage_name, request.subpackage_version or None
+                ).schema
+            # Waits until the package has been analyzed.
+            return self.provider.registry.schema
+
+        return provider_pb2.GetSchemaResponse(schema=await asyncio.to_thread(schema))
+
+
+def serve(args: list[str], servicer: Callable[[str], ProviderServicer]) -> None:
+    """
+    serve is `pulumi.provider.main`, with the servicer returned by `servicer`
+    for the engine address.
+    """
+    argp = argparse.ArgumentParser(description="Pulumi provider plugin (gRPC server)")
+    argp.add_argument("engine", help="Pulumi engine address")
+    known_args, _ = argp.parse_known_args(args)
+
+    async def run() -> None:
+        server = grpc.aio.server(options=_GRPC_CHANNEL_OPTIONS)
+        provider_pb2_grpc.add_ResourceProviderServicer_to_server(
+            servicer(known_args.engine), server
+        )
+        port = server.add_insecure_port(address="127.0.0.1:0")
+        await server.start()
+        sys.stdout.buffer.write(f"{port}\n".encode())
+        sys.stdout.buffer.flush()
+        await server.wait_for_termination()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
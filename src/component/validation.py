@@ -0,0 +1,131 @@
+import inspect
+from collections.abc import Mapping
+from typing import Any, Callable
+
+import pulumi
+from pulumi.output import Unknown
+from pulumi.runtime import rpc
+
+from .analyzer import ComponentSchema, SchemaProperty, TypeDefinition
+
+# A Validator checks a dictionary of inputs, keyed by schema property name,
+# and returns a list of `(property_path, reason)` violations.
+Validator = Callable[[Mapping[str, Any], str], list[tuple[str, str]]]
+InputsValidator = Callable[[Mapping[str, Any]], list[tuple[str, str]]]
+
+
+class InputValidationError(pulumi.InputPropertiesError):
+    """
+    InputValidationError is raised for a construct request with invalid
+    inputs. The provider reports it to the engine as an INVALID_ARGUMENT error
+    with one entry per invalid property.
+    """
+
+    def __init__(self, resource_type: str, errors: list[tuple[str, str]]):
+        self.resource_type = resource_type
+        details = "\n".join(f"  {path}: {reason}" for path, reason in errors)
+        super().__init__(
+            f"Invalid inputs for {resource_type}:\n{details}",
+            [{"property_path": path, "reason": reason} for path, reason in errors],
+        )
+
+
+def compile_validator(
+    component: ComponentSchema, type_definitions: dict[str, TypeDefinition]
+) -> InputsValidator:
+    """
+    compile_validator returns a function that checks the inputs of a construct
+    request against the analyzed inputs of `component`, before we instantiate
+    the component.
+
+    It checks that required inputs are present, that scalars have the right
+    type and that the properties of object types are valid too. Values that are
+    not known yet, see `is_unknown`, are not checked.
+    """
+    validators: dict[str, Validator] = {}
+
+    def ref_validator(ref: str) -> Validator:
+        # Compile every type once, and look it up when validating so that
+        # self-referencing types work.
+        if ref not in validators:
+            validators[ref] = lambda value, path: []
+            type_def = type_definitions.get(ref.split(":")[-1])
+            if type_def is not None:
+                validators[ref] = object_validator(type_def.properties)
+        return lambda value, path: validators[ref](value, path)
+
+    def object_validator(properties: dict[str, SchemaProperty]) -> Validator:
+        checks = [(k, property_validator(prop), prop) for k, prop in properties.items()]
+
+        def validate(value: Mapping[str, Any], path: str) -> list[tuple[str, str]]:
+            errors: list[tuple[str, str]] = []
+            for k, check, prop in checks:
+                property_path = f"{path}.{k}" if path else k
+                v = value.get(k)
+                if v is None:
+                    if not prop.optional:
+                        errors.append((property_path, "missing required property"))
+                    continue
+                if is_unknown(v):
+                    continue
+                errors.extend(check(v, property_path))
+            return errors
+
+        return validate
+
+    def property_validator(prop: SchemaProperty) -> Validator:
+        if prop.ref is not None:
+            validate_ref = ref_validator(prop.ref)
+
+            def validate(value: Any, path: str) -> list[tuple[str, str]]:
+                if not isinstance(value, Mapping):
+                    return [(path, f"expected an object, got {type_name(value)}")]
+                return validate_ref(value, path)
+
+            return validate
+        if prop.type_ is not None:
+            return scalar_validator(prop.type_)
+        return lambda value, path: []
+
+    validate_inputs = object_validator(component.inputs)
+    return lambda inputs: validate_inputs(inputs, "")
+
+
+def scalar_validator(typ: type) -> Validator:
+    def validate(value: Any, path: str) -> list[tuple[str, str]]:
+        if not is_instance(value, typ):
+            return [(path, f"expected {typ.__name__}, got {type_name(value)}")]
+        return []
+
+    return validate
+
+
+def is_instance(value: Any, typ: type) -> bool:
+    # bool is a subclass of int, but not a valid number.
+    if isinstance(value, bool):
+        return typ is bool
+    if typ is int:
+        # Numbers arrive as floats from the engine.
+        return isinstance(value, int) or (
+            isinstance(value, float) and value.is_integer()
+        )
+    if typ is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, typ)
+
+
+def is_unknown(value: Any) -> bool:
+    """
+    Whether `value` can't be checked before the component is constructed: an
+    Output or Awaitable, a value that is unknown during preview, or a secret,
+    which arrives wrapped when nested in another input.
+    """
+    return (
+        isinstance(value, (pulumi.Output, Unknown))
+        or inspect.isawaitable(value)
+        or rpc.is_rpc_secret(value)
+    )
+
+
+def type_name(value: Any) -> str:
+    return type(value).__name__
@@ -0,0 +1,93 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+from dataclasses import asdict
+from pathlib import Path
+from typing import Any, Optional
+
+from . import host
+from .analyzer import Analyzer
+from .metadata import Metadata
+from .schema import package_spec
+
+# The worker analyzes a component package in a short-lived subprocess, so that
+# the provider process doesn't have to import all the user modules and keep
+# the analyzer state alive. The worker writes the schema and an index of where
+# to find each component to a pipe.
+
+
+def analyze_in_subprocess(
+    metadata: Metadata, path: Path, dedupe_types: bool = False
+) -> tuple[dict[str, Any], dict[str, tuple[Path, str]]]:
+    """
+    analyze_in_subprocess returns the schema of the component package at
+    `path`, and for each component the file and module attribute it can be
+    loaded from.
+    """
+    read_fd, write_fd = os.pipe()
+    args = [
+        sys.executable,
+        "-m",
+        "component.worker",
+        str(write_fd),
+        str(path.absolute()),
+        json.dumps(asdict(metadata)),
+    ]
+    if dedupe_types:
+        args.append("--dedupe-types")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(p for p in sys.path if p))
+    # The provider's stdout is used to tell the engine the port we're
+    # listening on, send any output of the user modules to stderr instead.
+    proc = subprocess.Popen(args, pass_fds=(write_fd,), env=env, stdout=2)
+    os.close(write_fd)
+    with os.fdopen(read_fd) as f:
+        output = f.read()
+    if proc.wait() != 0:
+        raise Exception(f"Analysis of {path} failed with exit code {proc.returncode}")
+    result = json.loads(output)
+    index = {
+        name: (path / file, attribute)
+        for name, (file, attribute) in result["index"].items()
+    }
+    return result["schema"], index
+
+
+def analyze_package(
+    metadata: Metadata, path: Path, dedupe_types: bool = False
+) -> tuple[dict[str, Any], dict[str, tuple[str, str]]]:
+    """
+    analyze_package returns the schema of the component package at `path`,
+    and for each component the file name and module attribute it can be
+    loaded from.
+    """
+    a = Analyzer(metadata, path)
+    components = a.analyze()
+    if dedupe_types:
+        a.dedupe_type_definitions(components)
+    spec = package_spec(metadata, components, a.type_definitions)
+    index = {
+        name: (file_path.name, attribute)
+        for name, (file_path, attribute) in a.component_locations.items()
+    }
+    return spec.to_json(), index
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m component.worker")
+    parser.add_argument("fd", type=int)
+    parser.add_argument("dir", type=Path)
+    parser.add_argument("metadata")
+    parser.add_argument("--dedupe-types", action="store_true")
+    args = parser.parse_args(argv)
+
+    metadata = Metadata(**json.loads(args.metadata))
+    with host.suppress_hosting():
+        schema, index = analyze_package(metadata, args.dir, args.dedupe_types)
+    with os.fdopen(args.fd, "w") as f:
+        json.dump({"schema": schema, "index": index}, f)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+import asyncio
+from collections.abc import Coroutine
+from typing import Any, Callable
+
+import pytest
+
+GREETING = """
+from dataclasses import dataclass
+
+import pulumi
+
+
+@dataclass
+class GreetingArgs:
+    name: pulumi.Input[str]
+
+
+class Greeting(pulumi.ComponentResource):
+    message: pulumi.Output[str]
+
+    def __init__(self, name: str, args: GreetingArgs, opts=None):
+        super().__init__("my-component:index:Greeting", name, {}, opts)
+        self.message = pulumi.Output.from_input(args.name).apply(
+            lambda n: f"Hello, {n}!"
+        )
+        self.register_outputs({"message": self.message})
+"""
+
+
+@pytest.fixture
+def greeting() -> Callable[[str], str]:
+    """
+    greeting returns the source of a module with a component that greets
+    its `name` input, named `Greeting` or the given name.
+    """
+    return lambda name="Greeting": GREETING.replace("Greeting", name)
+
+
+@pytest.fixture
+def run() -> Callable[[Coroutine[Any, Any, Any]], Any]:
+    """
+    run runs a coroutine to completion on a new event loop. Don't use
+    asyncio.run, it unsets the current event loop, which the mocks in other
+    tests rely on.
+    """
+
+    def run(coro):
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
+    return run
@@ -1,13 +1,17 @@
 import ast
 import inspect
+import sys
 import textwrap
 from pathlib import Path
 from typing import Optional
 
 import pulumi
+import pytest
 
 from component.analyzer import Analyzer, ComponentSchema, SchemaProperty, TypeDefinition
 from component.metadata import Metadata
+from component.modules import unload_package
+from component.registration import registrations
 
 metadata = Metadata("my-component", "0.0.1")
 
@@ -222,3 +226,231 @@ def test_find_docstrings():
             "cn": "The common name.",
         },
     }
+
+
+def test_dedupe_type_definitions():
+    class Tags:
+        key: pulumi.Input[str]
+
+    class Labels:
+        """Same shape as Tags."""
+
+        key: pulumi.Input[str]
+
+    class Owner:
+        tags: pulumi.Input[Tags]
+
+    class Maintainer:
+        tags: pulumi.Input[Labels]
+
+    class ThingArgs:
+        tags: pulumi.Input[Tags]
+        labels: Optional[pulumi.Input[Labels]]
+        owner: pulumi.Input[Owner]
+        maintainer: pulumi.Input[Maintainer]
+
+    class Thing(pulumi.ComponentResource):
+        labels: pulumi.Output[Labels]
+
+        def __init__(self, args: ThingArgs):
+            pass
+
+    a = Analyzer(metadata, Path("."))
+    components = {"Thing": a.analyze_component(Thing)}
+    a.dedupe_type_definitions(components)
+
+    assert list(a.type_definitions.keys()) == ["Tags", "Owner"]
+    assert a.type_definitions["Owner"].properties["tags"].ref == (
+        "#/types/my-component:index:Tags"
+    )
+    comp = components["Thing"]
+    assert comp.inputs["labels"] == SchemaProperty(
+        ref="#/types/my-component:index:Tags", optional=True
+    )
+    assert comp.inputs["maintainer"].ref == "#/types/my-component:index:Owner"
+    assert comp.outputs["labels"].ref == "#/types/my-component:index:Tags"
+
+
+COMPONENT_SRC = """
+import pulumi
+import pytest
+
+
+class WidgetArgs:
+    size: pulumi.Input[int]
+
+
+class Widget(pulumi.ComponentResource):
+    def __init__(self, name: str, args: WidgetArgs, opts=None):
+        pass
+"""
+
+
+def test_analyze_skips_imported_components(tmp_path: Path):
+    (tmp_path / "base.py").write_text(COMPONENT_SRC)
+    (tmp_path / "reexport.py").write_text("from base import Widget\n\nAlias = Widget\n")
+
+    a = Analyzer(metadata, tmp_path)
+    comps = a.analyze()
+    assert list(comps.keys()) == ["Widget"]
+    assert a.component_locations == {"Widget": (tmp_path / "base.py", "Widget")}
+    # The sibling import resolves to the module the analyzer loaded.
+    assert "base" not in sys.modules
+    unload_package(tmp_path)
+
+
+def test_analyze_skips_aliases(tmp_path: Path):
+    (tmp_path / "widgets.py").write_text(COMPONENT_SRC + "\n\nAlias = Widget\n")
+
+    a = Analyzer(metadata, tmp_path)
+    comps = a.analyze()
+    assert list(comps.keys()) == ["Widget"]
+    assert a.component_locations == {"Widget": (tmp_path / "widgets.py", "Widget")}
+    unload_package(tmp_path)
+
+
+def test_analyze_component_name_clash(tmp_path: Path):
+    (tmp_path / "a.py").write_text(COMPONENT_SRC)
+    (tmp_path / "b.py").write_text(COMPONENT_SRC)
+
+    a = Analyzer(metadata, tmp_path)
+    with pytest.raises(Exception, match="Component Widget is defined in both"):
+        a.analyze()
+
+
+def same_named_types_src(component: str, tag_type: str) -> str:
+    return textwrap.dedent(
+        f"""
+        import pulumi
+
+
+        class Tags:
+            value: pulumi.Input[{tag_type}]
+
+
+        class {component}Args:
+            tags: pulumi.Input[Tags]
+
+
+        class {component}(pulumi.ComponentResource):
+            def __init__(self, args: {component}Args):
+                pass
+        """
+    )
+
+
+def test_analyze_merges_same_named_types(tmp_path: Path):
+    (tmp_path / "a.py").write_text(same_named_types_src("First", "str"))
+    (tmp_path / "b.py").write_text(same_named_types_src("Second", "str"))
+
+    a = Analyzer(metadata, tmp_path)
+    comps = a.analyze()
+    assert list(a.type_definitions.keys()) == ["Tags"]
+    for comp in comps.values():
+        assert comp.inputs["tags"].ref == "#/types/my-component:index:Tags"
+    unload_package(tmp_path)
+
+
+def test_analyze_same_named_types_conflict(tmp_path: Path):
+    (tmp_path / "a.py").write_text(same_named_types_src("First", "str"))
+    (tmp_path / "b.py").write_text(same_named_types_src("Second", "int"))
+
+    a = Analyzer(metadata, tmp_path)
+    with pytest.raises(Exception, match="Tags is defined differently in .*a.py and .*b.py"):
+        a.analyze()
+    unload_package(tmp_path)
+
+
+REGISTERED_SRC = """
+from dataclasses import dataclass
+
+import pulumi
+
+from component import Component
+
+
+@dataclass
+class WidgetArgs:
+    size: pulumi.Input[int]
+
+
+class Base(Component, register=False):
+    pass
+
+
+class Widget(Base):
+    url: pulumi.Output[str]
+    \"\"\"The URL of the widget.\"\"\"
+
+    def __init__(self, name: str, args: WidgetArgs, opts=None):
+        pass
+
+
+class Special(Widget):
+    \"\"\"A special widget.\"\"\"
+"""
+
+
+def test_analyze_registered_components(tmp_path: Path):
+    (tmp_path / "widgets.py").write_text(REGISTERED_SRC)
+
+    a = Analyzer(metadata, tmp_path)
+    comps = a.analyze()
+    assert list(comps.keys()) == ["Widget", "Special"]
+    assert comps["Special"].description == "A special widget."
+    assert comps["Special"].inputs == {"size": SchemaProperty(type_=int)}
+    # Outputs are inherited too.
+    assert comps["Special"].outputs == {
+        "url": SchemaProperty(type_=str, description="The URL of the widget.")
+    }
+
+    comp, args = a.find_component("Special")
+    assert comp is a.component_classes["Special"]
+    assert args.__name__ == "WidgetArgs"
+
+    module = sys.modules[comp.__module__]
+    registered = registrations[module.__name__]
+    assert [r.component.__name__ for r in registered] == ["Widget", "Special"]
+    assert registered[0].file == str(tmp_path / "widgets.py")
+    # The line of the class statement, or of its __init__ before Python 3.13
+    class_line = REGISTERED_SRC.splitlines().index("class Widget(Base):") + 1
+    assert registered[0].line in (class_line, class_line + 1)
+
+    unload_package(tmp_path)
+    assert module.__name__ not in registrations
+
+
+MIXED_SRC = """
+from dataclasses import dataclass
+
+import pulumi
+
+from component import Component
+
+
+@dataclass
+class WidgetArgs:
+    size: pulumi.Input[int]
+
+
+class Registered(Component):
+    def __init__(self, name: str, args: WidgetArgs, opts=None):
+        pass
+
+
+class Plain(pulumi.ComponentResource):
+    def __init__(self, name: str, args: WidgetArgs, opts=None):
+        pass
+"""
+
+
+def test_analyze_registered_and_plain_components(tmp_path: Path):
+    (tmp_path / "mixed.py").write_text(MIXED_SRC)
+
+    # Modules that register components aren't searched for other components.
+    a = Analyzer(metadata, tmp_path)
+    assert list(a.analyze().keys()) == ["Registered"]
+
+    a = Analyzer(metadata, tmp_path, scan_unregistered=True)
+    assert list(a.analyze().keys()) == ["Registered", "Plain"]
+    unload_package(tmp_path)
@@ -0,0 +1,75 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from component import host
+from component.batch import find_packages, run_batch
+
+MAIN = """from component.host import componentProviderHost
+from component.metadata import Metadata
+
+componentProviderHost(Metadata(name="{name}", version="1.0.0"))
+"""
+
+
+@pytest.fixture
+def monorepo(tmp_path: Path) -> Path:
+    root = tmp_path / "repo"
+    for name in ("pkg-a", "nested/pkg-b", ".venv/ignored"):
+        path = root / name
+        shutil.copytree("tests/testdata/tls", path)
+        (path / "__main__.py").write_text(MAIN.format(name=Path(name).name))
+    (root / "not-a-package").mkdir()
+    (root / "not-a-package" / "__main__.py").write_text("print('hello')\n")
+    return root
+
+
+def test_find_packages(monorepo: Path):
+    assert find_packages(monorepo) == [
+        (monorepo / "nested" / "pkg-b").absolute(),
+        (monorepo / "pkg-a").absolute(),
+    ]
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_run_batch(monorepo: Path, tmp_path: Path, workers: int, monkeypatch):
+    monkeypatch.setattr(host, "is_hosting", False)
+    out = tmp_path / "out"
+    results = run_batch(monorepo, out, workers=workers)
+    assert not host.is_hosting
+    assert [(r.name, r.components, r.types, r.error) for r in results] == [
+        ("pkg-b", 1, 1, None),
+        ("pkg-a", 1, 1, None),
+    ]
+    schema = json.loads((out / "pkg-a" / "schema.json").read_text())
+    assert list(schema["resources"].keys()) == ["pkg-a:index:SelfSignedCertificate"]
+    index = json.loads((out / "pkg-a" / "index.json").read_text())
+    assert index == {
+        "SelfSignedCertificate": {
+            "file": "__init__.py",
+            "attribute": "SelfSignedCertificate",
+        }
+    }
+
+
+def test_run_batch_reports_broken_and_duplicate_packages(
+    monorepo: Path, tmp_path: Path
+):
+    broken = monorepo / "broken"
+    shutil.copytree("tests/testdata/tls", broken)
+    (broken / "__main__.py").write_text("componentProviderHost(\n")
+    duplicate = monorepo / "pkg-c"
+    shutil.copytree("tests/testdata/tls", duplicate)
+    (duplicate / "__main__.py").write_text(MAIN.format(name="pkg-a"))
+
+    results = run_batch(monorepo, tmp_path / "out")
+    assert [(r.path.name, r.name, r.error is None) for r in results] == [
+        ("broken", "broken", False),
+        ("pkg-b", "pkg-b", True),
+        ("pkg-a", "pkg-a", True),
+        ("pkg-c", "pkg-a", False),
+    ]
+    assert results[0].error.startswith("SyntaxError")
+    assert results[3].error == f"The package at {results[2].path} is named pkg-a too"
@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from component.loadtest import run_load_test
+from component.metadata import Metadata
+from component.provider import ComponentProvider
+
+metadata = Metadata("my-component", "0.0.1")
+
+def test_run_load_test(tmp_path: Path, greeting, run):
+    (tmp_path / "greeting.py").write_text(greeting())
+    provider = ComponentProvider(metadata, tmp_path)
+    report = run(
+        run_load_test(
+            provider,
+            "my-component:index:Greeting",
+            {"name": "World"},
+            constructs=20,
+            schemas=5,
+            concurrency=4,
+        )
+    )
+    assert report.errors == {}
+    assert report.registrations == 20
+    assert len(report.latencies["Construct"]) == 20
+    assert len(report.latencies["GetSchema"]) == 5
+    assert report.percentile("Construct", 50) <= report.percentile("Construct", 99)
+    assert report.samples
+    assert report.to_json()["methods"]["Construct"]["calls"] == 20
@@ -0,0 +1,42 @@
+from pathlib import Path
+
+import pulumi
+
+from component import host
+from component.local import LocalPackage
+from component.metadata import Metadata
+
+metadata = Metadata("my-component", "0.0.1")
+
+class Mocks(pulumi.runtime.Mocks):
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        return (f"{args.name}_id", args.inputs)
+
+    def call(self, args: pulumi.runtime.MockCallArgs):
+        return {}
+
+
+def test_local_construct(tmp_path: Path, monkeypatch, greeting):
+    monkeypatch.setattr(host, "is_hosting", False)
+    (tmp_path / "greeting.py").write_text(greeting())
+    pulumi.runtime.set_mocks(Mocks())
+
+    @pulumi.runtime.test
+    def check():
+        package = LocalPackage(tmp_path, metadata)
+        assert not host.is_hosting
+        result = package.construct(
+            "greeting", "my-component:index:Greeting", {"name": "World"}
+        )
+        assert list(result.state.keys()) == ["message"]
+
+        def check_outputs(outputs):
+            urn, message = outputs
+            assert "my-component:index:Greeting::greeting" in urn
+            assert message == "Hello, World!"
+
+        return pulumi.Output.all(result.urn, result.state["message"]).apply(
+            check_outputs
+        )
+
+    check()
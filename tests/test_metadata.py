@@ -0,0 +1,23 @@
+from pathlib import Path
+
+from component.metadata import Metadata, read_metadata
+
+
+def test_read_metadata(tmp_path: Path):
+    (tmp_path / "__main__.py").write_text(
+        """
+from component.host import componentProviderHost
+from component.metadata import Metadata
+
+componentProviderHost(
+    Metadata(name="my-component", version="1.2.3", display_name="My Component")
+)
+"""
+    )
+    assert read_metadata(tmp_path) == Metadata(
+        name="my-component", version="1.2.3", display_name="My Component"
+    )
+
+
+def test_read_metadata_default(tmp_path: Path):
+    assert read_metadata(tmp_path) == Metadata(tmp_path.name, "0.0.1")
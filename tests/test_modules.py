@@ -0,0 +1,97 @@
+import sys
+from pathlib import Path
+
+from component.analyzer import Analyzer
+from component.metadata import Metadata
+from component.modules import package_namespace, unload_package
+
+metadata = Metadata("my-component", "0.0.1")
+
+
+def test_load_module_namespaces(tmp_path: Path):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "utils.py").write_text(f'VALUE = "{name}"\n')
+
+    a = Analyzer(metadata, tmp_path / "a")
+    b = Analyzer(metadata, tmp_path / "b")
+    mod_a = a.load_module(tmp_path / "a" / "utils.py")
+    mod_b = b.load_module(tmp_path / "b" / "utils.py")
+    assert mod_a.VALUE == "a"
+    assert mod_b.VALUE == "b"
+    assert mod_a.__name__ != mod_b.__name__
+    assert mod_a.__name__.startswith(package_namespace(tmp_path / "a") + ".")
+    assert a.load_module(tmp_path / "a" / "utils.py") is mod_a
+
+    assert sorted(unload_package(tmp_path / "a")) == [
+        package_namespace(tmp_path / "a"),
+        mod_a.__name__,
+    ]
+    assert mod_a.__name__ not in sys.modules
+    assert mod_b.__name__ in sys.modules
+
+    (tmp_path / "a" / "utils.py").write_text('VALUE = "reloaded"\n')
+    assert a.load_module(tmp_path / "a" / "utils.py").VALUE == "reloaded"
+    unload_package(tmp_path / "a")
+    unload_package(tmp_path / "b")
+
+
+def test_sibling_imports(tmp_path: Path):
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "utils.py").write_text(f'VALUE = "{name}"\n')
+        (tmp_path / name / "helpers").mkdir()
+        (tmp_path / name / "helpers" / "__init__.py").write_text("")
+        (tmp_path / name / "helpers" / "names.py").write_text(
+            "from utils import VALUE\n\nNAME = VALUE.upper()\n"
+        )
+        (tmp_path / name / "comp.py").write_text(
+            "import helpers.names\nfrom utils import VALUE\n\n"
+            "NAME = helpers.names.NAME\n"
+        )
+
+    a = Analyzer(metadata, tmp_path / "a")
+    b = Analyzer(metadata, tmp_path / "b")
+    comp_a = a.load_module(tmp_path / "a" / "comp.py")
+    comp_b = b.load_module(tmp_path / "b" / "comp.py")
+    assert (comp_a.VALUE, comp_a.NAME) == ("a", "A")
+    assert (comp_b.VALUE, comp_b.NAME) == ("b", "B")
+    # Siblings are loaded once, in the package's namespace.
+    assert "utils" not in sys.modules
+    assert "helpers" not in sys.modules
+    assert a.load_module(tmp_path / "a" / "utils.py") is sys.modules[
+        f"{package_namespace(tmp_path / 'a')}.utils"
+    ]
+
+    unload_package(tmp_path / "a")
+    assert not [
+        name
+        for name in sys.modules
+        if name.startswith(package_namespace(tmp_path / "a"))
+    ]
+    assert comp_b.__name__ in sys.modules
+    unload_package(tmp_path / "b")
+
+
+def test_unload_package_plain_imports(tmp_path: Path, monkeypatch):
+    (tmp_path / "plain_sibling.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import plain_sibling  # noqa: F401
+
+    assert unload_package(tmp_path) == ["plain_sibling"]
+    assert "plain_sibling" not in sys.modules
+
+
+def test_unload_package_keeps_virtualenv(tmp_path: Path, monkeypatch):
+    site_packages = tmp_path / ".venv" / "lib" / "site-packages"
+    site_packages.mkdir(parents=True)
+    (site_packages / "venv_dependency.py").write_text("VALUE = 1\n")
+    (tmp_path / "plain_sibling.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(site_packages))
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import plain_sibling  # noqa: F401
+    import venv_dependency  # noqa: F401
+
+    assert unload_package(tmp_path) == ["plain_sibling"]
+    assert "venv_dependency" in sys.modules
+    del sys.modules["venv_dependency"]
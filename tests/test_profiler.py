@@ -0,0 +1,28 @@
+from pathlib import Path
+
+from component import host
+from component.cli import main
+from component.metadata import Metadata
+from component.profiler import profile
+
+metadata = Metadata("my-component", "0.0.1")
+
+
+def test_profile():
+    report = profile(metadata, Path("tests/testdata/tls"))
+    assert [m.file for m in report.modules] == ["__init__.py"]
+    assert list(report.components.keys()) == ["SelfSignedCertificate"]
+    assert report.docstrings_seconds > 0
+    assert report.total_seconds >= report.modules[0].seconds
+    assert report.peak_memory_bytes > 0
+
+    table = report.to_table()
+    assert "SelfSignedCertificate" in table
+    assert report.to_json()["components"] == report.components
+
+
+def test_profile_cli_restores_hosting(tmp_path: Path, capsys, monkeypatch):
+    monkeypatch.setattr(host, "is_hosting", False)
+    main(["profile", "tests/testdata/tls", "--json", str(tmp_path / "profile.json")])
+    assert not host.is_hosting
+    assert "SelfSignedCertificate" in capsys.readouterr().out
@@ -0,0 +1,151 @@
+import gc
+import json
+import shutil
+import sys
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pulumi
+import pytest
+
+from component.metadata import Metadata
+from component.provider import ComponentProvider
+from component.registry import ComponentRegistry, RegistryCache
+from component.validation import InputValidationError
+
+metadata = Metadata("my-component", "0.0.1")
+
+
+def make_package(tmp_path: Path, name: str, version: str = "1.0.0") -> Path:
+    path = tmp_path / f"{name}-{version}"
+    shutil.copytree("tests/testdata/tls", path)
+    (path / "__main__.py").write_text(
+        "from component.metadata import Metadata\n"
+        f'metadata = Metadata(name="{name}", version="{version}")\n'
+    )
+    return path
+
+
+def test_parameterize_args(tmp_path: Path):
+    provider = ComponentProvider(metadata, Path("tests/testdata/tls"))
+    assert json.loads(provider.schema or "")["name"] == "my-component"
+
+    path = make_package(tmp_path, "other")
+    result = provider.parameterize_args([str(path)])
+    assert result == Metadata(name="other", version="1.0.0")
+
+    schema = json.loads(provider.schema or "")
+    assert schema["name"] == "other"
+    assert "other:index:SelfSignedCertificate" in schema["resources"]
+    assert schema["parameterization"]["baseProvider"] == {
+        "name": "my-component",
+        "version": "0.0.1",
+    }
+
+    assert provider.registry_for("other:index:SelfSignedCertificate").path == path
+    assert (
+        provider.registry_for("my-component:index:SelfSignedCertificate")
+        is provider.registry
+    )
+
+
+def test_parameterize_versions(tmp_path: Path):
+    provider = ComponentProvider(metadata, Path("tests/testdata/tls"))
+    v1 = make_package(tmp_path, "other", "1.0.0")
+    v2 = make_package(tmp_path, "other", "2.0.0")
+    provider.parameterize_args([str(v1)])
+    provider.parameterize_args([str(v2)])
+
+    assert provider.registry_for_package("other", "1.0.0").path == v1
+    assert provider.registry_for_package("other", "2.0.0").path == v2
+    assert json.loads(provider.registry_for_package("other", "1.0.0").schema)[
+        "version"
+    ] == "1.0.0"
+    # Constructs go to the version we were last parameterized with.
+    assert provider.registry_for("other:index:SelfSignedCertificate").path == v2
+    with pytest.raises(Exception, match="Unknown package other version 3.0.0"):
+        provider.registry_for_package("other", "3.0.0")
+
+
+def test_parameterize_concurrently(tmp_path: Path, monkeypatch):
+    provider = ComponentProvider(metadata, Path("tests/testdata/tls"))
+    path = make_package(tmp_path, "other")
+    analyzed = []
+    load = ComponentRegistry.load
+
+    def counting_load(self):
+        analyzed.append(self.path)
+        # Give the other threads time to ask for the package too.
+        time.sleep(0.1)
+        load(self)
+
+    monkeypatch.setattr(ComponentRegistry, "load", counting_load)
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        registries = list(
+            pool.map(lambda _: provider.parameterized_registry(path), range(32))
+        )
+    assert analyzed == [path]
+    assert all(r is registries[0] for r in registries)
+
+
+def test_evicted_packages_are_freed(tmp_path: Path):
+    provider = ComponentProvider(metadata, Path("tests/testdata/tls"), max_packages=1)
+    first = make_package(tmp_path, "first")
+    second = make_package(tmp_path, "second")
+
+    def weakrefs(package: str) -> list[weakref.ref]:
+        registry = provider.registry_for_package(package)
+        component = registry.find_component("SelfSignedCertificate").component
+        return [
+            weakref.ref(registry),
+            weakref.ref(component),
+            weakref.ref(sys.modules[component.__module__]),
+        ]
+
+    provider.parameterize_args([str(first)])
+    refs = weakrefs("first")
+    provider.parameterize_args([str(second)])
+    gc.collect()
+    assert [r() for r in refs] == [None, None, None]
+
+    # Evicting the package we were last parameterized with frees it too.
+    refs = weakrefs("second")
+    provider.registry_for_package("first", "1.0.0")
+    gc.collect()
+    assert [r() for r in refs] == [None, None, None]
+
+
+def test_registry_cache_eviction(tmp_path: Path):
+    paths = [make_package(tmp_path, f"pkg{i}") for i in range(3)]
+    registries = [ComponentRegistry(metadata, p) for p in paths]
+
+    cache = RegistryCache(max_entries=2)
+    cache.put(paths[0], registries[0])
+    cache.put(paths[1], registries[1])
+    assert cache.get(paths[0]) is registries[0]
+    cache.put(paths[2], registries[2])
+    # pkg1 is the least recently used
+    assert list(cache.entries.keys()) == [paths[0], paths[2]]
+    assert cache.schema_bytes == registries[0].schema_size + registries[2].schema_size
+
+    cache = RegistryCache(max_schema_bytes=registries[0].schema_size + 1)
+    cache.put(paths[0], registries[0])
+    cache.put(paths[1], registries[1])
+    assert list(cache.entries.keys()) == [paths[1]]
+
+
+def test_construct_validates_inputs():
+    registry = ComponentRegistry(metadata, Path("tests/testdata/tls"))
+    with pytest.raises(InputValidationError) as e:
+        registry.construct(
+            "cert",
+            "my-component:index:SelfSignedCertificate",
+            {"algorithm": 1, "subject": {}},
+        )
+    assert isinstance(e.value, pulumi.InputPropertiesError)
+    assert e.value.errors == [
+        {"property_path": "algorithm", "reason": "expected str, got int"},
+        {"property_path": "subject.cn", "reason": "missing required property"},
+    ]
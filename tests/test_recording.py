@@ -0,0 +1,133 @@
+import cProfile
+import json
+from pathlib import Path
+
+import grpc
+from google.protobuf import struct_pb2
+from pulumi.runtime import rpc
+from pulumi.runtime.proto import provider_pb2, provider_pb2_grpc
+
+from component.loadtest import start_fakes
+from component.metadata import Metadata
+from component.provider import ComponentProvider
+from component.recording import (
+    REDACTED,
+    ConstructRecord,
+    Recorder,
+    RecordingServicer,
+    read_recording,
+    replay,
+)
+
+metadata = Metadata("my-component", "0.0.1")
+
+def construct_request(name: str, inputs: dict) -> provider_pb2.ConstructRequest:
+    request_inputs = struct_pb2.Struct()
+    request_inputs.update(inputs)
+    return provider_pb2.ConstructRequest(
+        project="project",
+        stack="stack",
+        organization="organization",
+        type="my-component:index:Greeting",
+        name=name,
+        inputs=request_inputs,
+        protect=True,
+    )
+
+
+async def record(provider: ComponentProvider, recorder: Recorder) -> None:
+    fakes, _, address = start_fakes(max_workers=4)
+    server = grpc.aio.server()
+    servicer = RecordingServicer(provider, [], address, recorder)
+    provider_pb2_grpc.add_ResourceProviderServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            stub = provider_pb2_grpc.ResourceProviderStub(channel)
+            request = construct_request("greeting", {"name": "World"})
+            request.monitorEndpoint = address
+            await stub.Construct(request)
+    finally:
+        await server.stop(None)
+        fakes.stop(None)
+
+
+def test_record(tmp_path: Path, greeting, run):
+    (tmp_path / "greeting.py").write_text(greeting())
+    provider = ComponentProvider(metadata, tmp_path)
+    recording = tmp_path / "recording.jsonl"
+
+    run(record(provider, Recorder(recording)))
+
+    lines = recording.read_text().splitlines()
+    assert len(lines) == 1
+    data = json.loads(lines[0])
+    assert data["error"] is None
+    assert data["seconds"] > 0
+    request = data["request"]
+    assert request["type"] == "my-component:index:Greeting"
+    assert request["name"] == "greeting"
+    assert request["inputs"] == {"name": "World"}
+    assert request["protect"] is True
+
+
+def test_replay(tmp_path: Path, greeting, run):
+    (tmp_path / "greeting.py").write_text(greeting())
+    provider = ComponentProvider(metadata, tmp_path)
+    recording = tmp_path / "recording.jsonl"
+    recorder = Recorder(recording)
+    recorder.record(ConstructRecord(construct_request("a", {"name": "A"}), 0.5))
+    recorder.record(ConstructRecord(construct_request("b", {}), 0.25))
+
+    records = read_recording(recording)
+    assert [r.request.name for r in records] == ["a", "b"]
+    profiler = cProfile.Profile()
+    results = run(replay(provider, records, profiler))
+
+    assert [r.name for r in results] == ["a", "b"]
+    assert results[0].error is None
+    assert results[0].recorded_seconds == 0.5
+    # The required `name` input is missing.
+    assert results[1].error is not None
+    assert "name" in results[1].error
+    profiler.create_stats()
+    assert any(
+        function == "construct" for (_, _, function) in profiler.stats  # type: ignore[attr-defined]
+    )
+
+
+def test_record_redacts_secrets(tmp_path: Path):
+    secret = {rpc._special_sig_key: rpc._special_secret_sig, "value": "hunter2"}
+    output = {
+        rpc._special_sig_key: rpc._special_output_value_sig,
+        "secret": True,
+        "value": "token",
+    }
+    request = construct_request(
+        "greeting",
+        {"name": "World", "password": secret, "nested": {"items": [output]}},
+    )
+    request.config["project:apiKey"] = "s3cr3t"
+    request.config["project:region"] = "us-west-2"
+    request.configSecretKeys.append("project:apiKey")
+
+    redacted_path = tmp_path / "redacted.jsonl"
+    Recorder(redacted_path).record(ConstructRecord(request, 0.1))
+    data = json.loads(redacted_path.read_text())["request"]
+    assert data["config"] == {"project:apiKey": REDACTED, "project:region": "us-west-2"}
+    assert data["inputs"]["name"] == "World"
+    assert data["inputs"]["password"] == {
+        rpc._special_sig_key: rpc._special_secret_sig,
+        "value": REDACTED,
+    }
+    assert data["inputs"]["nested"]["items"][0]["value"] == REDACTED
+    assert "hunter2" not in redacted_path.read_text()
+    # The request itself is left alone.
+    assert request.config["project:apiKey"] == "s3cr3t"
+
+    kept_path = tmp_path / "kept.jsonl"
+    Recorder(kept_path, keep_secrets=True).record(ConstructRecord(request, 0.1))
+    data = json.loads(kept_path.read_text())["request"]
+    assert data["config"]["project:apiKey"] == "s3cr3t"
+    assert data["inputs"]["password"]["value"] == "hunter2"
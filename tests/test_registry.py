@@ -0,0 +1,60 @@
+import sys
+import threading
+import types
+from pathlib import Path
+
+import pytest
+
+from component.metadata import Metadata
+from component.registry import ComponentRegistry
+
+metadata = Metadata("my-component", "0.0.1")
+
+COMPONENT = """
+import pulumi
+
+
+class FastArgs:
+    name: pulumi.Input[str]
+
+
+class Fast(pulumi.ComponentResource):
+    url: pulumi.Output[str]
+
+    def __init__(self, name: str, args: FastArgs, opts=None):
+        pass
+"""
+
+SLOW = """
+import warm_up_gate
+
+warm_up_gate.event.wait(10)
+"""
+
+
+def test_background_registry(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    gate = types.SimpleNamespace(event=threading.Event())
+    monkeypatch.setitem(sys.modules, "warm_up_gate", gate)
+    (tmp_path / "a_component.py").write_text(COMPONENT)
+    (tmp_path / "b_slow.py").write_text(SLOW)
+
+    registry = ComponentRegistry(metadata, tmp_path, background=True)
+    # Available while the slow module is still loading.
+    entry = registry.find_component("Fast")
+    assert entry.component.__name__ == "Fast"
+    assert entry.outputs == ["url"]
+    assert entry.validator({}) == [("name", "missing required property")]
+    assert not registry.done
+
+    gate.event.set()
+    assert "my-component:index:Fast" in registry.schema
+    assert registry.done
+
+
+def test_background_registry_error(tmp_path: Path):
+    (tmp_path / "broken.py").write_text("raise ValueError('broken')\n")
+    registry = ComponentRegistry(metadata, tmp_path, background=True)
+    with pytest.raises(ValueError):
+        registry.schema
+    with pytest.raises(ValueError):
+        registry.find_component("Fast")
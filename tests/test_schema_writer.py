@@ -0,0 +1,26 @@
+import io
+import json
+from pathlib import Path
+
+from component.metadata import Metadata
+from component.schema import generate_schema
+from component.schema_writer import emit_schema
+
+metadata = Metadata("my-component", "0.0.1", display_name="My Component")
+
+
+def test_emit_schema_matches_generate_schema():
+    path = Path("tests/testdata/tls")
+    f = io.StringIO()
+    emit_schema(metadata, path, f)
+    assert json.loads(f.getvalue()) == generate_schema(metadata, path).to_json()
+
+
+def test_emit_schema_is_deterministic():
+    path = Path("tests/testdata/tls")
+    first = io.StringIO()
+    emit_schema(metadata, path, first)
+    second = io.StringIO()
+    emit_schema(metadata, path, second)
+    assert first.getvalue() == second.getvalue()
+    assert first.getvalue() == json.dumps(json.loads(first.getvalue()))
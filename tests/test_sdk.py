@@ -0,0 +1,74 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pulumi
+
+from component.metadata import Metadata
+from component.sdk import gen_sdk
+
+metadata = Metadata("my-component", "1.0.0")
+
+
+class Mocks(pulumi.runtime.Mocks):
+    def __init__(self):
+        self.resources: list[pulumi.runtime.MockResourceArgs] = []
+
+    def new_resource(self, args: pulumi.runtime.MockResourceArgs):
+        self.resources.append(args)
+        return (f"{args.name}_id", {**args.inputs, "privateKey": "secret"})
+
+    def call(self, args: pulumi.runtime.MockCallArgs):
+        return {}
+
+
+def test_gen_sdk(tmp_path: Path, monkeypatch):
+    written = gen_sdk(metadata, Path("tests/testdata/tls"), tmp_path)
+    package = tmp_path / "pulumi_my_component"
+    assert sorted(p.relative_to(tmp_path) for p in written) == [
+        Path("pulumi_my_component/__init__.py"),
+        Path("pulumi_my_component/_types.py"),
+        Path("pulumi_my_component/self_signed_certificate.py"),
+        Path("pyproject.toml"),
+    ]
+    # Nothing changed, nothing to write.
+    assert gen_sdk(metadata, Path("tests/testdata/tls"), tmp_path) == []
+
+    # Generated files of removed components are deleted.
+    stale = package / "stale.py"
+    stale.write_text((package / "_types.py").read_text())
+    gen_sdk(metadata, Path("tests/testdata/tls"), tmp_path)
+    assert not stale.exists()
+
+    monkeypatch.syspath_prepend(str(tmp_path))
+    sdk = importlib.import_module("pulumi_my_component")
+    try:
+        mocks = Mocks()
+        pulumi.runtime.set_mocks(mocks)
+
+        @pulumi.runtime.test
+        def check():
+            cert = sdk.SelfSignedCertificate(
+                "cert",
+                sdk.SelfSignedCertificateArgs(
+                    ecdsa_curve="P224", subject=sdk.SubjectArgs(cn="example.com")
+                ),
+            )
+
+            def check_outputs(outputs):
+                ecdsa_curve, private_key = outputs
+                assert ecdsa_curve == "P224"
+                assert private_key == "secret"
+                assert mocks.resources[0].typ == "my-component:index:SelfSignedCertificate"
+                assert mocks.resources[0].inputs["ecdsaCurve"] == "P224"
+                assert mocks.resources[0].inputs["subject"] == {"cn": "example.com"}
+
+            return pulumi.Output.all(cert.ecdsa_curve, cert.private_key).apply(
+                check_outputs
+            )
+
+        check()
+    finally:
+        for name in list(sys.modules):
+            if name.startswith("pulumi_my_component"):
+                del sys.modules[name]
@@ -0,0 +1,144 @@
+import asyncio
+import json
+import shutil
+import sys
+import threading
+import types
+from pathlib import Path
+
+import grpc
+import pytest
+from google.protobuf import struct_pb2
+from pulumi.runtime.proto import provider_pb2, provider_pb2_grpc
+
+from component.loadtest import start_fakes
+from component.metadata import Metadata
+from component.provider import ComponentProvider
+from component.server import ComponentProviderServicer
+
+metadata = Metadata("my-component", "0.0.1")
+
+
+async def serve(provider: ComponentProvider, calls, engine_address="127.0.0.1:0"):
+    server = grpc.aio.server()
+    servicer = ComponentProviderServicer(provider, [], engine_address)
+    provider_pb2_grpc.add_ResourceProviderServicer_to_server(servicer, server)
+    port = server.add_insecure_port("127.0.0.1:0")
+    await server.start()
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{port}") as channel:
+            return await calls(provider_pb2_grpc.ResourceProviderStub(channel))
+    finally:
+        await server.stop(None)
+
+
+def test_parameterize(tmp_path: Path, run):
+    path = tmp_path / "other"
+    shutil.copytree("tests/testdata/tls", path)
+    (path / "__main__.py").write_text(
+        "from component.metadata import Metadata\n"
+        'metadata = Metadata(name="other", version="1.0.0")\n'
+    )
+    provider = ComponentProvider(metadata, Path("tests/testdata/tls"))
+
+    async def calls(stub):
+        by_args = await stub.Parameterize(
+            provider_pb2.ParameterizeRequest(
+                args=provider_pb2.ParameterizeRequest.ParametersArgs(args=[str(path)])
+            )
+        )
+        by_value = await stub.Parameterize(
+            provider_pb2.ParameterizeRequest(
+                value=provider_pb2.ParameterizeRequest.ParametersValue(
+                    name="other", version="1.0.0", value=str(path).encode()
+                )
+            )
+        )
+        base = await stub.GetSchema(provider_pb2.GetSchemaRequest())
+        other = await stub.GetSchema(
+            provider_pb2.GetSchemaRequest(
+                subpackage_name="other", subpackage_version="1.0.0"
+            )
+        )
+        return by_args, by_value, base, other
+
+    by_args, by_value, base, other = run(serve(provider, calls))
+    assert (by_args.name, by_args.version) == ("other", "1.0.0")
+    assert (by_value.name, by_value.version) == ("other", "1.0.0")
+    assert json.loads(base.schema)["name"] == "my-component"
+    other_schema = json.loads(other.schema)
+    assert other_schema["name"] == "other"
+    assert other_schema["parameterization"]["baseProvider"]["name"] == "my-component"
+
+
+SLOW = """
+import server_gate
+
+server_gate.event.wait(10)
+"""
+
+
+def test_construct_waits_off_the_event_loop(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, greeting, run
+):
+    gate = types.SimpleNamespace(event=threading.Event())
+    monkeypatch.setitem(sys.modules, "server_gate", gate)
+    (tmp_path / "a_fast.py").write_text(greeting("Fast"))
+    (tmp_path / "b_slow.py").write_text(SLOW)
+    (tmp_path / "c_late.py").write_text(greeting("Late"))
+    provider = ComponentProvider(metadata, tmp_path, warm_up=True)
+    fakes, monitor, address = start_fakes(max_workers=4)
+
+    def request(component: str) -> provider_pb2.ConstructRequest:
+        inputs = struct_pb2.Struct()
+        inputs.update({"name": "World"})
+        return provider_pb2.ConstructRequest(
+            project="project",
+            stack="stack",
+            monitorEndpoint=address,
+            type=f"my-component:index:{component}",
+            name=component.lower(),
+            inputs=inputs,
+        )
+
+    async def calls(stub):
+        late = asyncio.ensure_future(stub.Construct(request("Late")))
+        # Late waits for the slow module, Fast is ready and goes ahead.
+        await asyncio.sleep(0.1)
+        await asyncio.wait_for(stub.Construct(request("Fast")), timeout=5)
+        assert not late.done()
+        gate.event.set()
+        await late
+
+    try:
+        run(serve(provider, calls, address))
+    finally:
+        gate.event.set()
+        fakes.stop(None)
+    assert monitor.registrations == 2
+
+
+def test_construct_invalid_inputs(tmp_path: Path, greeting, run):
+    (tmp_path / "greeting.py").write_text(greeting())
+    provider = ComponentProvider(metadata, tmp_path)
+    fakes, _, address = start_fakes(max_workers=4)
+
+    async def calls(stub):
+        with pytest.raises(grpc.aio.AioRpcError) as e:
+            await stub.Construct(
+                provider_pb2.ConstructRequest(
+                    project="project",
+                    stack="stack",
+                    monitorEndpoint=address,
+                    type="my-component:index:Greeting",
+                    name="greeting",
+                )
+            )
+        return e.value
+
+    try:
+        error = run(serve(provider, calls, address))
+    finally:
+        fakes.stop(None)
+    assert error.code() == grpc.StatusCode.INVALID_ARGUMENT
+    assert "name: missing required property" in error.details()
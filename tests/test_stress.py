@@ -0,0 +1,260 @@
+import ast
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Optional, TypeVar, Union
+
+import pulumi
+import pytest
+
+from component.analyzer import Analyzer
+from component.metadata import Metadata
+from component.schema import generate_schema
+
+# Adversarial type graphs, to catch performance cliffs in the analyzer like
+# quadratic iteration, analyzing the same type over and over or unbounded
+# recursion. Rather than bounding the wall-clock time, which depends on the
+# machine, the tests count the calls the analyzer makes, or compare the time
+# for inputs of different sizes. The memory bounds are generous, the cliffs
+# they guard against use orders of magnitude more.
+
+metadata = Metadata("my-component", "0.0.1")
+
+FIELDS = 10_000
+
+T = TypeVar("T")
+
+
+def peak_memory(fn: Callable[[], T], megabytes: float) -> T:
+    """
+    peak_memory calls `fn` under tracemalloc, and checks that its peak memory
+    use stays below `megabytes`.
+    """
+    tracemalloc.start()
+    try:
+        result = fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert peak < megabytes * 1024 * 1024, f"peak memory {peak / 1024 / 1024:.1f}MiB"
+    return result
+
+
+def growth(
+    small: Callable[[], Any], large: Callable[[], Any], repeat: int = 5
+) -> float:
+    """
+    growth returns how many times longer `large` takes than `small`, taking the
+    fastest of `repeat` runs of each, which is the least disturbed by the rest
+    of the machine.
+    """
+
+    def fastest(fn: Callable[[], Any]) -> float:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - start)
+        return min(times)
+
+    return fastest(large) / fastest(small)
+
+
+def count_calls(a: Analyzer, method: str) -> list[tuple]:
+    """
+    count_calls records the arguments of every call to `method` of `a`,
+    including the recursive ones.
+    """
+    calls: list[tuple] = []
+    original = getattr(a, method)
+
+    def counted(*args, **kwargs):
+        calls.append(args)
+        return original(*args, **kwargs)
+
+    setattr(a, method, counted)
+    return calls
+
+
+def wide_args_source(fields: int, docstrings: bool) -> str:
+    lines = ["class WideArgs:"]
+    for i in range(fields):
+        lines.append(f"    field_{i}: Optional[pulumi.Input[str]]")
+        if docstrings:
+            lines.append(f'    """Field number {i}."""')
+    return "\n".join(lines) + "\n"
+
+
+def test_wide_args_class():
+    WideArgs = type(
+        "WideArgs",
+        (),
+        {
+            "__annotations__": {
+                f"field_{i}": Optional[pulumi.Input[str]] for i in range(FIELDS)
+            }
+        },
+    )
+    a = Analyzer(metadata, Path("."))
+    calls = count_calls(a, "analyze_arg")
+    types = peak_memory(lambda: a.analyze_types(WideArgs), megabytes=100)
+    assert len(types) == FIELDS
+    # `Optional[pulumi.Input[str]]`, then `str`.
+    assert len(calls) == 2 * FIELDS
+
+
+@pytest.mark.parametrize("docstrings", [True, False])
+def test_find_docstrings_wide_class(docstrings):
+    small = ast.parse(wide_args_source(FIELDS // 4, docstrings))
+    large = ast.parse(wide_args_source(FIELDS, docstrings))
+    a = Analyzer(metadata, Path("."))
+    docs = peak_memory(lambda: a.find_docstrings_in_module(large), megabytes=50)
+    assert len(docs["WideArgs"]) == (FIELDS if docstrings else 0)
+    # 4 times the fields take about 4 times as long, quadratic iteration would
+    # take 16 times as long.
+    assert (
+        growth(
+            lambda: a.find_docstrings_in_module(small),
+            lambda: a.find_docstrings_in_module(large),
+        )
+        < 10
+    )
+
+
+def test_deeply_nested_annotations():
+    # Nesting `pulumi.Input` itself is exponential in `typing`, which hashes
+    # the members of every Union it builds, so we nest Outputs under a single
+    # Optional Input.
+    typ = str
+    for _ in range(50):
+        typ = Optional[pulumi.Output[typ]]  # type: ignore
+    typ = Optional[pulumi.Input[typ]]  # type: ignore
+
+    class Args:
+        deep: typ  # type: ignore
+
+    a = Analyzer(metadata, Path("."))
+    calls = count_calls(a, "analyze_arg")
+    types = peak_memory(lambda: a.analyze_types(Args), megabytes=10)
+    assert types["deep"].type_ is str
+    assert types["deep"].optional
+    # A call for each Optional and Output, the Input and `str`.
+    assert len(calls) == 2 * 50 + 2
+
+
+def test_diamond_type_reuse():
+    # Every level references the previous one twice, without reusing the
+    # analysis of a type this takes 2^depth steps.
+    depth = 40
+    level: type = type("Level0", (), {"__annotations__": {"value": str}})
+    for i in range(1, depth + 1):
+        level = type(
+            f"Level{i}",
+            (),
+            {
+                "__annotations__": {
+                    "left": pulumi.Input[level],
+                    "right": Optional[pulumi.Input[level]],
+                }
+            },
+        )
+
+    a = Analyzer(metadata, Path("."))
+    calls = count_calls(a, "analyze_types")
+    types = peak_memory(lambda: a.analyze_types(level), megabytes=10)
+    assert types["left"].ref == types["right"].ref
+    assert len(a.type_definitions) == depth
+    # Every level is analyzed once.
+    assert len(calls) == depth + 1
+
+
+def test_wide_union():
+    members = [
+        type(f"Member{i}", (), {"__annotations__": {"value": str}}) for i in range(500)
+    ]
+    wide = Union[tuple(members)]  # type: ignore
+
+    a = Analyzer(metadata, Path("."))
+    calls = count_calls(a, "analyze_arg")
+
+    def analyze():
+        with pytest.raises(ValueError, match="Unsupported union type"):
+            a.analyze_arg(wide)  # type: ignore
+        with pytest.raises(ValueError, match="Unsupported union type"):
+            a.analyze_arg(Optional[wide])  # type: ignore
+
+    peak_memory(analyze, megabytes=10)
+    assert a.type_definitions == {}
+    # The members are never analyzed.
+    assert len(calls) == 2
+
+
+def test_self_referencing_type():
+    class Node:
+        pass
+
+    Node.__annotations__ = {
+        "value": pulumi.Input[str],
+        "next": Optional[pulumi.Input[Node]],
+    }
+
+    class Tree:
+        pass
+
+    Tree.__annotations__ = {
+        "left": Optional[pulumi.Input[Tree]],
+        "right": Optional[pulumi.Input[Tree]],
+        "nodes": Optional[pulumi.Input[Node]],
+    }
+
+    class Args:
+        tree: pulumi.Input[Tree]
+
+    a = Analyzer(metadata, Path("."))
+    calls = count_calls(a, "analyze_types")
+    types = peak_memory(lambda: a.analyze_types(Args), megabytes=10)
+    assert [typ.__name__ for typ, in calls] == ["Args", "Tree", "Node"]
+    assert types["tree"].ref == "#/types/my-component:index:Tree"
+    tree = a.type_definitions["Tree"]
+    assert tree.properties["left"].ref == "#/types/my-component:index:Tree"
+    assert tree.properties["nodes"].ref == "#/types/my-component:index:Node"
+    node = a.type_definitions["Node"]
+    assert node.properties["next"].ref == "#/types/my-component:index:Node"
+
+
+def wide_package(path: Path, fields: int) -> Path:
+    source = "\n".join(
+        [
+            "from typing import Optional",
+            "",
+            "import pulumi",
+            "",
+            "",
+            wide_args_source(fields, docstrings=True),
+            "",
+            "class Wide(pulumi.ComponentResource):",
+            "    def __init__(self, args: WideArgs):",
+            "        pass",
+        ]
+    )
+    path.mkdir()
+    (path / "wide.py").write_text(source + "\n")
+    return path
+
+
+def test_generate_schema_wide_package(tmp_path):
+    small = wide_package(tmp_path / "small", FIELDS // 4)
+    large = wide_package(tmp_path / "large", FIELDS)
+
+    assert (
+        growth(
+            lambda: generate_schema(metadata, small),
+            lambda: generate_schema(metadata, large),
+            repeat=2,
+        )
+        < 10
+    )
+    spec = peak_memory(lambda: generate_schema(metadata, large), megabytes=200)
+    wide = spec.to_json()["resources"]["my-component:index:Wide"]
+    assert len(wide["inputProperties"]) == FIELDS
+    assert wide["inputProperties"]["field0"]["description"] == "Field number 0."
@@ -0,0 +1,101 @@
+from pathlib import Path
+from typing import Optional
+
+import pulumi
+from google.protobuf import struct_pb2
+from pulumi.provider.server import ProviderServicer
+from pulumi.runtime import rpc
+
+from component.analyzer import Analyzer
+from component.metadata import Metadata
+from component.validation import compile_validator
+
+metadata = Metadata("my-component", "0.0.1")
+
+
+class Subject:
+    cn: pulumi.Input[str]
+    org: Optional[pulumi.Input[str]]
+
+
+class CertificateArgs:
+    algorithm: pulumi.Input[str]
+    rsa_bits: Optional[pulumi.Input[int]]
+    ratio: Optional[pulumi.Input[float]]
+    enabled: Optional[pulumi.Input[bool]]
+    subject: Optional[pulumi.Input[Subject]]
+
+
+class Certificate(pulumi.ComponentResource):
+    def __init__(self, args: CertificateArgs):
+        pass
+
+
+def validator():
+    a = Analyzer(metadata, Path("."))
+    return compile_validator(a.analyze_component(Certificate), a.type_definitions)
+
+
+def test_validate_valid_inputs():
+    validate = validator()
+    assert validate({"algorithm": "RSA"}) == []
+    assert (
+        validate(
+            {
+                "algorithm": "RSA",
+                "rsaBits": 2048.0,
+                "ratio": 1,
+                "enabled": True,
+                "subject": {"cn": "example.com"},
+            }
+        )
+        == []
+    )
+
+
+def test_validate_reports_all_errors():
+    validate = validator()
+    assert validate(
+        {
+            "rsaBits": 2048.5,
+            "ratio": "1",
+            "enabled": 1,
+            "subject": {"org": 1},
+        }
+    ) == [
+        ("algorithm", "missing required property"),
+        ("rsaBits", "expected int, got float"),
+        ("ratio", "expected float, got str"),
+        ("enabled", "expected bool, got int"),
+        ("subject.cn", "missing required property"),
+        ("subject.org", "expected str, got int"),
+    ]
+    assert validate({"algorithm": "RSA", "subject": "example.com"}) == [
+        ("subject", "expected an object, got str"),
+    ]
+
+
+def test_validate_skips_unknowns():
+    validate = validator()
+
+    async def unknown():
+        return 1
+
+    awaitable = unknown()
+    assert validate({"algorithm": awaitable}) == []
+    awaitable.close()
+
+
+def test_validate_skips_nested_unknowns(run):
+    # Inputs as the provider receives them during preview, with an unknown
+    # nested in an object.
+    inputs = struct_pb2.Struct()
+    inputs.update({"algorithm": "RSA", "subject": {"cn": rpc.UNKNOWN}})
+    values = run(ProviderServicer._construct_inputs(inputs, {}))
+
+    assert validator()(values) == []
+
+
+def test_validate_skips_secrets():
+    secret = {rpc._special_sig_key: rpc._special_secret_sig, "value": "RSA"}
+    assert validator()({"algorithm": secret}) == []
@@ -0,0 +1,46 @@
+import sys
+from pathlib import Path
+
+from component.metadata import Metadata
+from component.modules import module_name
+from component.registry import ComponentRegistry
+from component.schema import generate_schema
+from component.worker import analyze_in_subprocess
+
+metadata = Metadata("my-component", "0.0.1")
+
+
+def test_analyze_in_subprocess():
+    path = Path("tests/testdata/tls")
+    schema, index = analyze_in_subprocess(metadata, path)
+    assert schema == generate_schema(metadata, path).to_json()
+    assert index == {
+        "SelfSignedCertificate": (path / "__init__.py", "SelfSignedCertificate")
+    }
+
+
+def test_isolated_registry_loads_modules_on_demand(tmp_path: Path):
+    (tmp_path / "comp.py").write_text(
+        """
+import pulumi
+
+
+class WidgetArgs:
+    size: pulumi.Input[int]
+
+
+class Widget(pulumi.ComponentResource):
+    def __init__(self, name: str, args: WidgetArgs, opts=None):
+        pass
+"""
+    )
+    (tmp_path / "other.py").write_text("VALUE = 1\n")
+
+    registry = ComponentRegistry(metadata, tmp_path, isolated=True)
+    assert "my-component:index:Widget" in registry.schema
+    assert module_name(tmp_path / "comp.py") not in sys.modules
+
+    entry = registry.find_component("Widget")
+    assert entry.component.__name__ == "Widget"
+    assert module_name(tmp_path / "comp.py") in sys.modules
+    assert module_name(tmp_path / "other.py") not in sys.modules